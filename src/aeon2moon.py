@@ -1,16 +1,23 @@
 #!/usr/bin/python3
-"""Aeon Timeline 2 Add/update moon phase at event start date.
+"""Aeon Timeline 2/3 Add/update moon phase at event start date.
 
-Version 0.5.0
-Requires Python 3.6+
+Version 0.6.0
+Requires Python 3.7+
+Requires aeon_timeline.py and extract_json.py in the same directory.
 
-usage: aeon2moon.py [-h] Sourcefile
+usage: aeon2moon.py [-h] [-e {conway,meeus}] [-l {0..9}] [--no-backup] Sourcefile
 
 positional arguments:
-  Sourcefile  The path of the .aeonzip file.
+  Sourcefile            The path of the .aeonzip or .aeon file.
 
 optional arguments:
-  -h, --help  show this help message and exit
+  -h, --help            show this help message and exit
+  -e {conway,meeus}, --engine {conway,meeus}
+                        Moon phase calculation: "conway" (fast, 20th and 21st centuries only), 
+                        or "meeus" (astronomical, valid over millennia). Default: conway.
+  -l {0..9}, --level {0..9}
+                        Compression level of the timeline data. Default: zlib default.
+  --no-backup           Do not keep the previous file as a ".bak" file.
   
 "Moon phase" event property: phase day (0 to 29, where 0=new moon, 15=full etc.)
 
@@ -20,10 +27,13 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import argparse
 from shutil import copy2
-from datetime import datetime
-from datetime import timedelta
 import os
 
+from aeon_timeline import Timeline
+from aeon_timeline import Timeline3
+from aeon_timeline import get_day_date
+from aeon_timeline import SECONDS_PER_DAY
+
 ERROR = '!'
 
 
@@ -34,6 +44,24 @@ def _(message):
 import zipfile
 import codecs
 import json
+import copy
+import struct
+import tempfile
+
+import mmap
+import shutil
+
+from extract_json import find_json_region
+
+ZIP_LOCAL_HEADER_SIZE = 30
+ZIP_DATA_DESCRIPTOR = 0x08
+ZIP_INTERNALS = ('fp', 'filelist', 'NameToInfo', 'start_dir')
+COPY_CHUNK_SIZE = 0x100000
+AEON3_RECORD_NAME = b'\x0e\x00\x00\x00\x00\x00\x00\x00timeline3.json'
+AEON3_TRAILER_SIZE = 36
+# bytes between the start of the trailer and the record name
+AEON3_SIZE_FIELDS = (0, 20)
+# offsets of the JSON part's size in the trailer
 
 
 def open_timeline(filePath):
@@ -55,40 +83,257 @@ def open_timeline(filePath):
         return f'{ERROR}No JSON part found in timeline data.', None
     try:
         jsonData = json.loads(jsonStr)
-    except('JSONDecodeError'):
-        return f'{ERROR}Invalid JSON data in timeline.'
-        None
+    except ValueError:
+        return f'{ERROR}Invalid JSON data in timeline.', None
+
     return 'Timeline data read in.', jsonData
 
 
-def save_timeline(jsonData, filePath):
+def copy_bytes(source, target, size):
+    """Copy size bytes from the source file's current position to the target file in chunks."""
+    remaining = size
+    while remaining > 0:
+        data = source.read(min(remaining, COPY_CHUNK_SIZE))
+        if not data:
+            raise EOFError(getattr(source, 'name', ''))
+
+        target.write(data)
+        remaining -= len(data)
+
+
+def replace_file(tempPath, filePath, backup):
+    """Replace filePath with the completely written file at tempPath.
+    
+    Positional arguments:
+        tempPath -- str: Path of the new file, located in the same directory.
+        filePath -- str: Path of the file to replace.
+        backup -- bool: If True, keep the previous file as a ".bak" file.
+    """
+    if backup and os.path.isfile(filePath):
+        backupPath = f'{filePath}.bak'
+        if os.path.isfile(backupPath):
+            os.remove(backupPath)
+        try:
+            os.link(filePath, backupPath)
+        except OSError:
+            copy2(filePath, backupPath)
+    if os.path.isfile(filePath):
+        shutil.copymode(filePath, tempPath)
+    os.replace(tempPath, filePath)
+
+
+def copy_zip_member(sourceZip, targetZip, info):
+    """Copy a zip member as raw compressed data, without recompressing it.
+    
+    Positional arguments:
+        sourceZip -- ZipFile opened for reading.
+        targetZip -- ZipFile opened for writing.
+        info -- ZipInfo of the member to copy.
+
+    Only members without extra fields, that are small enough not to need
+    ZIP64 extensions, are copied raw. 
+    Other members are decompressed and compressed again through the zipfile API.
+    """
+    # The zipfile API cannot write compressed data unchanged.
+    # So raw copying uses the ZipFile internals that ZipFile.writestr() maintains itself.
+    # If they are missing, e.g. in another zipfile implementation, the public API is used instead.
+    if (getattr(sourceZip, 'fp', None) is not None
+            and all(hasattr(targetZip, name) for name in ZIP_INTERNALS)):
+        sourceZip.fp.seek(info.header_offset)
+        localHeader = sourceZip.fp.read(ZIP_LOCAL_HEADER_SIZE)
+        nameLength, extraLength = struct.unpack('<HH', localHeader[26:30])
+        if not (extraLength or info.extra
+                or info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT):
+            sourceZip.fp.seek(info.header_offset + ZIP_LOCAL_HEADER_SIZE + nameLength + extraLength)
+            newInfo = copy.copy(info)
+            newInfo.flag_bits &= ~ZIP_DATA_DESCRIPTOR
+            # CRC and sizes are known, so they go into the local header.
+            newInfo.header_offset = targetZip.fp.tell()
+            targetZip.fp.write(newInfo.FileHeader())
+            copy_bytes(sourceZip.fp, targetZip.fp, info.compress_size)
+            targetZip.filelist.append(newInfo)
+            targetZip.NameToInfo[newInfo.filename] = newInfo
+            targetZip.start_dir = targetZip.fp.tell()
+            return
+
+    newInfo = zipfile.ZipInfo(info.filename, info.date_time)
+    newInfo.compress_type = info.compress_type
+    newInfo.comment = info.comment
+    newInfo.create_system = info.create_system
+    newInfo.external_attr = info.external_attr
+    newInfo.file_size = info.file_size
+    with sourceZip.open(info) as source:
+        with targetZip.open(newInfo, 'w', force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as target:
+            shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
+
+
+def save_timeline(jsonData, filePath, compressLevel=None, backup=True):
     """Write the timeline to a zipfile located at filePath.
     
     Positional arguments:
         jsonData -- Python object containing the timeline structure.
         filePath -- Path of the .aeon project file to write.
+
+    Optional arguments:
+        compressLevel -- int: Deflate compression level 0..9. Default: zlib's default.
+        backup -- bool: If True, keep the previous file as a ".bak" file.
         
+    The new file is written to a temporary file in the same directory
+    and synced to disk before it replaces the previous file.
+    All other members of the previous file are copied without recompression.
     Return a message beginning with the ERROR constant in case of error.
     """
-    if os.path.isfile(filePath):
-        os.replace(filePath, f'{filePath}.bak')
-        backedUp = True
-    else:
-        backedUp = False
+    dirPath = os.path.dirname(os.path.abspath(filePath))
+    fd, tempPath = tempfile.mkstemp(suffix='.tmp', dir=dirPath)
     try:
-        with zipfile.ZipFile(filePath, 'w', compression=zipfile.ZIP_DEFLATED) as f:
-            f.writestr('timeline.json', json.dumps(jsonData))
+        with os.fdopen(fd, 'wb') as f:
+            with zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=compressLevel) as newZip:
+                jsonWritten = False
+                if os.path.isfile(filePath):
+                    with zipfile.ZipFile(filePath, 'r') as oldZip:
+                        for info in oldZip.infolist():
+                            if info.filename == 'timeline.json':
+                                newZip.writestr('timeline.json', json.dumps(jsonData))
+                                jsonWritten = True
+                            else:
+                                copy_zip_member(oldZip, newZip, info)
+                if not jsonWritten:
+                    newZip.writestr('timeline.json', json.dumps(jsonData))
+            f.flush()
+            os.fsync(f.fileno())
+        replace_file(tempPath, filePath, backup)
     except:
-        if backedUp:
-            os.replace(f'{filePath}.bak', filePath)
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
         return f'{ERROR}Cannot write "{os.path.normpath(filePath)}".'
 
     return f'"{os.path.normpath(filePath)}" written.'
 
 
-from hashlib import pbkdf2_hmac
+def open_aeon3(filePath):
+    """Read an Aeon Timeline 3 '.aeon' project file.
+
+    Positional arguments:
+        filePath -- Path of the .aeon project file to read.
+        
+    The JSON part is followed by zero padding and a record trailer
+    holding the JSON part's size. 
+    Return a message beginning with the ERROR constant in case of error,
+    a Python object containing the timeline structure,
+    and a tuple (start, end, trailer) of the JSON part's offsets.
+    """
+    try:
+        with open(filePath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mappedFile:
+                region = find_json_region(mappedFile)
+                if region is None:
+                    return f'{ERROR}Corrupted data.', None, None
+
+                start, end = region
+                if start == end:
+                    return f'{ERROR}No JSON part found in timeline data.', None, None
+
+                recordName = mappedFile.find(AEON3_RECORD_NAME, end)
+                trailer = recordName - AEON3_TRAILER_SIZE
+                if recordName < 0 or trailer < end:
+                    return f'{ERROR}Unknown file structure.', None, None
+
+                jsonBytes = mappedFile[start:end]
+    except:
+        return f'{ERROR}Cannot read timeline data.', None, None
+
+    try:
+        jsonData = json.loads(jsonBytes)
+    except ValueError:
+        return f'{ERROR}Invalid JSON data in timeline.', None, None
+
+    return 'Timeline data read in.', jsonData, (start, end, trailer)
+
+
+def save_aeon3(jsonData, filePath, layout, backup=True):
+    """Splice the timeline into an Aeon Timeline 3 '.aeon' project file.
+    
+    Positional arguments:
+        jsonData -- Python object containing the timeline structure.
+        filePath -- Path of the .aeon project file to write.
+        layout -- tuple (start, end, trailer) as returned by open_aeon3().
+
+    Optional arguments:
+        backup -- bool: If True, keep the previous file as a ".bak" file.
+        
+    The JSON part is written into the space between its start and the trailer, 
+    so all other offsets in the file remain valid. 
+    The binary data before and after is streamed through unchanged,
+    except for the JSON part's size in the trailer.
+    The file cannot be enlarged, because the offsets stored behind the trailer are not known,
+    so writing is limited to files with spare padding behind the JSON part.
+    If the JSON part does not fit into the space, or if the trailer does not hold 
+    the JSON part's previous size, the file is left untouched.
+    Return a message beginning with the ERROR constant in case of error.
+    """
+    start, end, trailer = layout
+    jsonBytes = json.dumps(jsonData, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    available = trailer - start
+    if len(jsonBytes) > available:
+        return (f'{ERROR}Cannot update "{os.path.normpath(filePath)}": '
+                f'Writing .aeon files is limited to files with spare padding behind the timeline data. '
+                f'{len(jsonBytes)} bytes needed, {available} bytes available.')
+
+    try:
+        with open(filePath, 'rb') as source:
+            source.seek(trailer)
+            trailerData = bytearray(source.read(AEON3_TRAILER_SIZE))
+    except:
+        return f'{ERROR}Cannot read "{os.path.normpath(filePath)}".'
+
+    sizeFields = []
+    for offset in AEON3_SIZE_FIELDS:
+        size, = struct.unpack_from('<Q', trailerData, offset)
+        if size == end - start:
+            sizeFields.append(offset)
+    if not sizeFields:
+        return f'{ERROR}Unknown file structure: Size of the timeline data not found in "{os.path.normpath(filePath)}".'
+
+    for offset in sizeFields:
+        struct.pack_into('<Q', trailerData, offset, len(jsonBytes))
+    dirPath = os.path.dirname(os.path.abspath(filePath))
+    fd, tempPath = tempfile.mkstemp(suffix='.tmp', dir=dirPath)
+    try:
+        with open(filePath, 'rb') as source, os.fdopen(fd, 'wb') as target:
+            copy_bytes(source, target, start)
+            target.write(jsonBytes)
+            target.write(bytes(available - len(jsonBytes)))
+            target.write(trailerData)
+            source.seek(trailer + AEON3_TRAILER_SIZE)
+            shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
+            target.flush()
+            os.fsync(target.fileno())
+        replace_file(tempPath, filePath, backup)
+    except:
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+        return f'{ERROR}Cannot write "{os.path.normpath(filePath)}".'
+
+    return f'"{os.path.normpath(filePath)}" written.'
+
+
+import hashlib
+from functools import lru_cache
 
 guidChars = list('ABCDEF0123456789')
+guidDigits = str.maketrans('0123456789abcdef', ''.join(guidChars))
+GUID_SIZES = (8, 4, 4, 4, 12)
+GUID_SALTS = (b'a', b'b', b'c', b'd', b'e')
+GUID_BLOCKS = tuple(salt + b'\x00\x00\x00\x01' for salt in GUID_SALTS)
+# PBKDF2 input for the first (and only) block of each salt
+GUID_CACHE_SIZE = 0x10000
+SHA1_BLOCK_SIZE = 64
+HMAC_INNER_PAD = bytes(x ^ 0x36 for x in range(256))
+HMAC_OUTER_PAD = bytes(x ^ 0x5C for x in range(256))
 
 
 def get_sub_guid(key, size):
@@ -97,15 +342,14 @@ def get_sub_guid(key, size):
     Positional arguments:
         key -- bytes: key.
         size -- length of the returned string.
+
+    The string consists of the key's base-16 digits, least significant first,
+    spelled with guidChars.
     """
-    keyInt = int.from_bytes(key, byteorder='big')
-    guid = ''
-    while len(guid) < size and keyInt > 0:
-        guid += guidChars[keyInt % len(guidChars)]
-        keyInt //= len(guidChars)
-    return guid
+    return key.hex().lstrip('0')[::-1][:size].translate(guidDigits)
 
 
+@lru_cache(maxsize=GUID_CACHE_SIZE)
 def get_uid(text):
     """Return a GUID for Aeon Timeline.
     
@@ -113,18 +357,37 @@ def get_uid(text):
         text -- string to generate a GUID from.
 
     GUID format: aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee
+    Each part is derived from pbkdf2_hmac('sha1', text, salt, 1) with its own salt.
+    With one iteration, this is the HMAC-SHA1 of salt + block number 1,
+    so the inner and outer hash states are prepared only once for all five parts.
     """
-    text = text.encode('utf-8')
-    sizes = [8, 4, 4, 4, 12]
-    salts = [b'a', b'b', b'c', b'd', b'e']
+    key = text.encode('utf-8')
+    if len(key) > SHA1_BLOCK_SIZE:
+        key = hashlib.sha1(key).digest()
+    key = key.ljust(SHA1_BLOCK_SIZE, b'\x00')
+    inner = hashlib.sha1(key.translate(HMAC_INNER_PAD))
+    outer = hashlib.sha1(key.translate(HMAC_OUTER_PAD))
     guid = []
-    for i in range(5):
-        key = pbkdf2_hmac('sha1', text, salts[i], 1)
-        guid.append(get_sub_guid(key, sizes[i]))
+    for block, size in zip(GUID_BLOCKS, GUID_SIZES):
+        blockInner = inner.copy()
+        blockInner.update(block)
+        blockOuter = outer.copy()
+        blockOuter.update(blockInner.digest())
+        guid.append(get_sub_guid(blockOuter.digest(), size))
     return '-'.join(guid)
 
 
+def get_uids(texts):
+    """Return a list of GUIDs for Aeon Timeline, one per text.
+    
+    Positional arguments:
+        texts -- iterable of str: strings to generate GUIDs from.
+    """
+    return [get_uid(text) for text in texts]
+
+
 import math
+from bisect import bisect_right
 
 
 def get_moon_phase(dateStr):
@@ -156,130 +419,356 @@ def get_moon_phase(dateStr):
     return r
 
 
+MOON_SIGNS = [
+    '🌑',
+    '🌑',
+    '🌒',
+    '🌒',
+    '🌒',
+    '🌒',
+    '🌓',
+    '🌓',
+    '🌓',
+    '🌓',
+    '🌔',
+    '🌔',
+    '🌔',
+    '🌔',
+    '🌕',
+    '🌕',
+    '🌕',
+    '🌖',
+    '🌖',
+    '🌖',
+    '🌖',
+    '🌗',
+    '🌗',
+    '🌗',
+    '🌗',
+    '🌘',
+    '🌘',
+    '🌘',
+    '🌘',
+    '🌑'
+]
+MOON_FRACTIONS = '00¼¼¼¼½½½½¾¾¾¾111¾¾¾¾½½½½¼¼¼¼0'
+MOON_PHASE_DISPLAY = [f'{r} [  {MOON_SIGNS[r]}  ] {MOON_FRACTIONS[r]}' for r in range(30)]
+ENGINE_CONWAY = 'conway'
+ENGINE_MEEUS = 'meeus'
+SYNODIC_MONTH = 29.530588861
+JD_LUNATION_0 = 2451550.09766
+JD_AEON_EPOCH = 1721425.5
+# Julian day of 0001-01-01 00:00 (proleptic Gregorian calendar)
+
+
 def get_moon_phase_plus(dateStr):
     """Return a string containing the moon phase plus a pseudo-graphic display.
     """
-    s = [
-        '🌑',
-        '🌑',
-        '🌒',
-        '🌒',
-        '🌒',
-        '🌒',
-        '🌓',
-        '🌓',
-        '🌓',
-        '🌓',
-        '🌔',
-        '🌔',
-        '🌔',
-        '🌔',
-        '🌕',
-        '🌕',
-        '🌕',
-        '🌖',
-        '🌖',
-        '🌖',
-        '🌖',
-        '🌗',
-        '🌗',
-        '🌗',
-        '🌗',
-        '🌘',
-        '🌘',
-        '🌘',
-        '🌘',
-        '🌑'
-    ]
-    p = '00¼¼¼¼½½½½¾¾¾¾111¾¾¾¾½½½½¼¼¼¼0'
-    r = get_moon_phase(dateStr)
-    return f'{r} [  {s[r]}  ] {p[r]}'
-
-
-VERSION = 'v0.5.0'
+    return MOON_PHASE_DISPLAY[get_moon_phase(dateStr)]
+
+
+def build_moon_phase_table():
+    """Return a flat list of Conway's phase days.
+    
+    The list is indexed by get_moon_phase_index().
+    """
+    table = []
+    for before2000 in (False, True):
+        for r19 in range(19):
+            for month in range(1, 13):
+                for day in range(1, 32):
+                    r = r19
+                    if r > 9:
+                        r -= 19
+                    r = ((r * 11) % 30) + month + day
+                    if month < 3:
+                        r += 2
+                    if before2000:
+                        r -= 4
+                    else:
+                        r -= 8.3
+                    table.append(math.floor(r + 0.5) % 30)
+    return table
+
+
+def get_moon_phase_index(year, month, day):
+    """Return the index of a date in the moon phase table.
+    
+    The phase only depends on (year mod 100) mod 19, the century, the month, and the day.
+    """
+    return ((((year < 2000) * 19 + (year % 100) % 19) * 12) + month - 1) * 31 + day - 1
+
+
+MOON_PHASE_TABLE = build_moon_phase_table()
+
+
+def get_moon_phases(timestamps, engine=ENGINE_CONWAY):
+    """Return the moon phases for a sequence of Aeon timestamps.
+    
+    Positional arguments:
+        timestamps -- iterable of int: Seconds since 0001-01-01 00:00, or None.
+
+    Optional arguments:
+        engine -- str: ENGINE_CONWAY or ENGINE_MEEUS.
+
+    Return a list of (phase day, display string) tuples in the order of the timestamps.
+    For missing timestamps, the tuple is (None, '').
+    """
+    if engine == ENGINE_MEEUS:
+        return get_meeus_phases(timestamps)
+
+    return get_conway_phases(timestamps)
+
+
+def get_conway_phases(timestamps):
+    """Return the moon phases for a sequence of Aeon timestamps, using Conway's algorithm.
+    
+    Each day is calculated only once.
+    BC dates are converted correctly, but Conway's approximation is poor that far back.
+    See get_moon_phases().
+    """
+    phases = []
+    days = {}
+    for timestamp in timestamps:
+        if timestamp is None:
+            phases.append((None, ''))
+            continue
+
+        dayNumber = int(timestamp // SECONDS_PER_DAY)
+        phase = days.get(dayNumber, None)
+        if phase is None:
+            r = MOON_PHASE_TABLE[get_moon_phase_index(*get_day_date(dayNumber))]
+            phase = (r, MOON_PHASE_DISPLAY[r])
+            days[dayNumber] = phase
+        phases.append(phase)
+    return phases
+
+
+@lru_cache(maxsize=0x10000)
+def get_new_moon(k):
+    """Return the Julian day (UT) of the new moon with lunation number k.
+
+    Lunation 0 is the new moon of 2000-01-06.
+    This is based on the mean lunation and the main periodic terms
+    from Jean Meeus, "Astronomical Algorithms", chapter 49.
+    The difference between dynamical time and universal time is estimated
+    with the Morrison/Stephenson parabola.
+    """
+    t = k / 1236.85
+    jde = (2451550.09766 + 29.530588861 * k + 0.00015437 * t ** 2
+           -0.000000150 * t ** 3 + 0.00000000073 * t ** 4)
+    e = 1 - 0.002516 * t - 0.0000074 * t ** 2
+    m = math.radians(2.5534 + 29.10535670 * k - 0.0000014 * t ** 2 - 0.00000011 * t ** 3)
+    mPrime = math.radians(201.5643 + 385.81693528 * k + 0.0107582 * t ** 2
+                          +0.00001238 * t ** 3 - 0.000000058 * t ** 4)
+    f = math.radians(160.7108 + 390.67050284 * k - 0.0016118 * t ** 2
+                     -0.00000227 * t ** 3 + 0.000000011 * t ** 4)
+    omega = math.radians(124.7746 - 1.56375588 * k + 0.0020672 * t ** 2 + 0.00000215 * t ** 3)
+    jde += (-0.40720 * math.sin(mPrime)
+            +0.17241 * e * math.sin(m)
+            +0.01608 * math.sin(2 * mPrime)
+            +0.01039 * math.sin(2 * f)
+            +0.00739 * e * math.sin(mPrime - m)
+            -0.00514 * e * math.sin(mPrime + m)
+            +0.00208 * e * e * math.sin(2 * m)
+            -0.00111 * math.sin(mPrime - 2 * f)
+            -0.00057 * math.sin(mPrime + 2 * f)
+            +0.00056 * e * math.sin(2 * mPrime + m)
+            -0.00042 * math.sin(3 * mPrime)
+            +0.00042 * e * math.sin(m + 2 * f)
+            +0.00038 * e * math.sin(m - 2 * f)
+            -0.00024 * e * math.sin(2 * mPrime - m)
+            -0.00017 * math.sin(omega))
+    u = (2000 + k / 12.3685 - 1820) / 100
+    deltaT = -20 + 32 * u * u
+    return jde - deltaT / SECONDS_PER_DAY
+
+
+def get_new_moons(firstJd, lastJd):
+    """Return a sorted list of new moon Julian days covering the given span."""
+    firstK = math.floor((firstJd - JD_LUNATION_0) / SYNODIC_MONTH) - 1
+    lastK = math.ceil((lastJd - JD_LUNATION_0) / SYNODIC_MONTH) + 1
+    return [get_new_moon(k) for k in range(firstK, lastK + 1)]
+
+
+def get_meeus_phases(timestamps):
+    """Return the moon phases for a sequence of Aeon timestamps, using an ephemeris.
+    
+    The new moons of the timestamps' span are calculated once;
+    the phase day is then the number of days since the preceding new moon,
+    found by binary search.
+    See get_moon_phases().
+    """
+    julianDays = []
+    for timestamp in timestamps:
+        if timestamp is None:
+            julianDays.append(None)
+        else:
+            julianDays.append(JD_AEON_EPOCH + timestamp / SECONDS_PER_DAY)
+    validDays = [jd for jd in julianDays if jd is not None]
+    if not validDays:
+        return [(None, '') for jd in julianDays]
+
+    newMoons = get_new_moons(min(validDays), max(validDays))
+    phases = []
+    for jd in julianDays:
+        if jd is None:
+            phases.append((None, ''))
+            continue
+
+        i = bisect_right(newMoons, jd) - 1
+        r = min(int(jd - newMoons[i]), 29)
+        phases.append((r, MOON_PHASE_DISPLAY[r]))
+    return phases
+
+
+VERSION = 'v0.6.0'
 AEON2_EXT = '.aeonzip'
+AEON3_EXT = '.aeon'
 PROPERTY_MOONPHASE = 'Moon phase'
 
 
-def run(filePath):
-    """Extract JSON data from an .aeonzip file
-    and add or update the "Moon phase" property. 
+class MoonPhaseCalculator:
+    """Calculate the "Moon phase" event property.
+
+    Public instance variables:
+        propertyName -- str: Name of the event property.
+        guidSeed -- str: Text to generate the property GUID from.
+    """
+
+    def __init__(self, engine=ENGINE_CONWAY):
+        """Set the moon phase calculation; ENGINE_CONWAY or ENGINE_MEEUS."""
+        self.propertyName = PROPERTY_MOONPHASE
+        self.guidSeed = 'propertyMoonphaseGuid'
+        self._engine = engine
+
+    def calculate(self, timestamps):
+        """Return a list of moon phase display strings, one per timestamp."""
+        return [display for __, display in get_moon_phases(timestamps, self._engine)]
+
+
+def enrich(filePath, calculators, compressLevel=None, backup=True, requireAd=True):
+    """Add or update calculated event properties in an .aeonzip or .aeon file.
+
+    Positional arguments:
+        filePath -- str: Path of the .aeonzip or .aeon file.
+        calculators -- list of calculator objects.
+
+    Optional arguments:
+        compressLevel -- int: Deflate compression level 0..9 (.aeonzip only). Default: zlib's default.
+        backup -- bool: If True, keep the previous file as a ".bak" file.
+        requireAd -- bool: If True, use the date calendar with an "AD" era.
+                     If False, use the first date calendar, whatever its eras.
+
+    A calculator has a propertyName and a guidSeed attribute, 
+    and a calculate(timestamps) method returning one property value per timestamp.
+    A calculator may have a set_calendar(calendar) method; 
+    if so, it is called with the calendar definition before calculate().
+    The timeline is read, indexed, traversed, and saved only once for all calculators.
+    If no value has changed, the file is left untouched.
     Return a message beginning with the ERROR constant in case of error.
     """
     if filePath.endswith(AEON2_EXT):
         message, jsonData = open_timeline(filePath)
         if message.startswith(ERROR):
             return message
+
+        timeline = Timeline(jsonData)
+    elif filePath.endswith(AEON3_EXT):
+        message, jsonData, layout = open_aeon3(filePath)
+        if message.startswith(ERROR):
+            return message
+
+        timeline = Timeline3(jsonData)
     else:
         return(f'{ERROR}File format not supported.')
 
     #--- Get the date definition.
-    for tplRgp in jsonData['template']['rangeProperties']:
-        if tplRgp['type'] == 'date':
-            for tplRgpCalEra in tplRgp['calendar']['eras']:
-                if tplRgpCalEra['name'] == 'AD':
-                    tplDateGuid = tplRgp['guid']
-                    break
-
-    if tplDateGuid is None:
-        return f'{ERROR}"AD" era is missing in the calendar.'
-
-    #--- Get GUID of user defined properties.
-    propertyMoonphaseGuid = None
-    for tplPrp in jsonData['template']['properties']:
-        if tplPrp['name'] == PROPERTY_MOONPHASE:
-            propertyMoonphaseGuid = tplPrp['guid']
-
-    #--- Create user defined properties, if missing.
-    if propertyMoonphaseGuid is None:
-        n = len(jsonData['template']['properties'])
-        propertyMoonphaseGuid = get_uid('propertyMoonphaseGuid')
-        jsonData['template']['properties'].append({
-            'calcMode': 'default',
-            'calculate': False,
-            'fadeEvents': False,
-            'guid': propertyMoonphaseGuid,
-            'icon': 'flag',
-            'isMandatory': False,
-            'name': PROPERTY_MOONPHASE,
-            'sortOrder': n,
-            'type': 'text'
-        })
-    for evt in jsonData['events']:
-
-        #--- Get date/time
-        timestamp = 0
-        for evtRgv in evt['rangeValues']:
-            if evtRgv['rangeProperty'] == tplDateGuid:
-                timestamp = evtRgv['position']['timestamp']
-                try:
-                    eventStart = datetime.min + timedelta(seconds=timestamp)
-                    startDateTime = eventStart.isoformat().split('T')
-                    eventMoonphase = get_moon_phase_plus(startDateTime[0])
-                except:
-                    eventMoonphase = ''
-
-        #--- Set moon phase.
-        hasMoonphase = False
-        for evtVal in evt['values']:
-            if evtVal['property'] == propertyMoonphaseGuid:
-                evtVal['value'] = eventMoonphase
-                hasMoonphase = True
-
-        #--- Add missing event properties.
-        if not hasMoonphase:
-            evt['values'].append({'property': propertyMoonphaseGuid, 'value': eventMoonphase})
-
-    # Create a backup file.
-    copy2(filePath, f'{filePath}.bak')
-    return save_timeline(jsonData, filePath)
+    if requireAd:
+        dateGuid = timeline.dateGuid
+        if dateGuid is None:
+            return f'{ERROR}"AD" era is missing in the calendar.'
+
+    else:
+        dateGuid = next(iter(timeline.calendars), None)
+        if dateGuid is None:
+            return f'{ERROR}Date definition is missing.'
+
+    for calculator in calculators:
+        set_calendar = getattr(calculator, 'set_calendar', None)
+        if set_calendar is not None:
+            set_calendar(timeline.calendars[dateGuid])
+
+    #--- Get GUID of user defined properties; create them, if missing.
+    propertyGuids = []
+    propertyAdded = False
+    for calculator in calculators:
+        propertyGuid = timeline.get_property_guid(calculator.propertyName)
+        if propertyGuid is None:
+            propertyGuid = timeline.add_property(calculator.propertyName, get_uid(calculator.guidSeed))
+            propertyAdded = True
+        propertyGuids.append(propertyGuid)
+
+    #--- Get date/time and calculate the property values.
+    timestamps = [timeline.get_timestamp(evt, dateGuid) for evt in timeline.events]
+    columns = [calculator.calculate(timestamps) for calculator in calculators]
+
+    #--- Set the values; add missing event properties.
+    changedEvents = 0
+    for evt, values in zip(timeline.events, zip(*columns)):
+        evtChanged = False
+        for propertyGuid, value in zip(propertyGuids, values):
+            if timeline.set_value(evt, propertyGuid, value):
+                evtChanged = True
+        changedEvents += evtChanged
+
+    propertyNames = ', '.join(calculator.propertyName for calculator in calculators)
+    if not (changedEvents or propertyAdded):
+        return f'"{os.path.normpath(filePath)}" is up to date. {propertyNames} changed in 0 events.'
+
+    if filePath.endswith(AEON3_EXT):
+        message = save_aeon3(jsonData, filePath, layout, backup)
+    else:
+        message = save_timeline(jsonData, filePath, compressLevel, backup)
+    if message.startswith(ERROR):
+        return message
+
+    return f'{message} {propertyNames} changed in {changedEvents} events.'
+
+
+def run(filePath, engine=ENGINE_CONWAY, compressLevel=None, backup=True):
+    """Extract JSON data from an .aeonzip or .aeon file
+    and add or update the "Moon phase" property. 
+
+    If no moon phase has changed, the file is left untouched.
+
+    Positional arguments:
+        filePath -- str: Path of the .aeonzip or .aeon file.
+
+    Optional arguments:
+        engine -- str: Moon phase calculation; ENGINE_CONWAY or ENGINE_MEEUS.
+        compressLevel -- int: Deflate compression level 0..9 (.aeonzip only). Default: zlib's default.
+        backup -- bool: If True, keep the previous file as a ".bak" file.
+
+    Return a message beginning with the ERROR constant in case of error.
+    """
+    return enrich(filePath, [MoonPhaseCalculator(engine)], compressLevel, backup)
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
-        description=f'Aeon Timeline 2 Add/update moon phase at event start date {VERSION}',
+        description=f'Aeon Timeline 2/3 Add/update moon phase at event start date {VERSION}',
         epilog='"Moon phase" event property: phase day (0 to 29, where 0=new moon, 15=full etc.)')
     parser.add_argument('sourcePath', metavar='Sourcefile',
-                        help='The path of the .aeonzip file.')
+                        help='The path of the .aeonzip or .aeon file.')
+    parser.add_argument('-e', '--engine', choices=[ENGINE_CONWAY, ENGINE_MEEUS], default=ENGINE_CONWAY,
+                        help='Moon phase calculation: '
+                        f'"{ENGINE_CONWAY}" (fast, 20th and 21st centuries only), '
+                        f'or "{ENGINE_MEEUS}" (astronomical, valid over millennia). '
+                        f'Default: {ENGINE_CONWAY}.')
+    parser.add_argument('-l', '--level', type=int, choices=range(10), default=None, metavar='{0..9}',
+                        help='Compression level of the timeline data. Default: zlib default.')
+    parser.add_argument('--no-backup', action='store_true',
+                        help='Do not keep the previous file as a ".bak" file.')
     args = parser.parse_args()
-    print(run(args.sourcePath))
+    print(run(args.sourcePath, args.engine, args.level, not args.no_backup))
@@ -0,0 +1,211 @@
+"""Stream Aeon Timeline CSV exports through a row transformation.
+
+The rows are read, transformed, and written one at a time,
+so memory use does not depend on the size of the export.
+The result is written to a temporary file that replaces the original file
+only after it has been completely written.
+
+Large files can be processed in chunks by a pool of worker processes.
+The chunks are written in their original order, so the output 
+does not depend on the number of workers.
+
+Usage:
+
+    process_csv(csvfile_path, 'New column', transform_row)
+    process_csv(csvfile_path, 'New column', transform_row, workers=None)
+
+The "Start Date" strings of the CSV export are parsed by parse_start_date(),
+which is shared by the alternate date/time scripts.
+
+Copyright (c) 2026 Peter Triesberger
+https://github.com/peter88213/paeon
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import csv
+from functools import lru_cache
+from functools import partial
+from itertools import islice
+import os
+import re
+import shutil
+import tempfile
+
+CHUNK_SIZE = 10000
+START_DATE_CACHE_SIZE = 0x10000
+START_DATE_PATTERN = re.compile(
+    r'(BC )?(-?\d+)-(\d\d)-(\d\d)'
+    r'(?: (\d\d):(\d\d)(?::(\d\d)(?:\.\d+)?)?)?$'
+)
+
+
+@lru_cache(maxsize=START_DATE_CACHE_SIZE)
+def parse_start_date(dt_str):
+    """Return a tuple of integer fields for an Aeon Timeline CSV date string.
+
+    Positional arguments:
+        dt_str -- str: e.g. "1933-02-07 01:17:00" or "BC 0044-03-15 12:00:00".
+
+    Return (year, month, day, hour, minute, second), or None if dt_str is not a date.
+    The year is numbered astronomically: 1 BC is year 0, 2 BC is year -1, and so on.
+    hour, minute, and second are None if the time is missing.
+    Timelines repeat the same dates a lot, so the results are cached.
+    """
+    match = START_DATE_PATTERN.match(dt_str.strip())
+    if match is None:
+        return None
+
+    is_bc, year, month, day, hour, minute, second = match.groups()
+    year = int(year)
+    month = int(month)
+    day = int(day)
+    if is_bc:
+        if year < 1:
+            return None
+
+        year = 1 - year
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return None
+
+    if hour is None:
+        return year, month, day, None, None, None
+
+    hour = int(hour)
+    minute = int(minute)
+    second = int(second or 0)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+
+    return year, month, day, hour, minute, second
+
+
+def get_fieldnames(fieldnames, label):
+    # Return the output column names, with the label column appended if missing.
+    # Duplicate column names are merged, as csv.DictReader does.
+    fieldnames = list(dict.fromkeys(fieldnames))
+    if label not in fieldnames:
+        fieldnames.append(label)
+    return fieldnames
+
+
+def transform_rows(csv_reader, transform_row):
+    # Generator: yield the transformed rows one by one.
+    for row in csv_reader:
+        yield transform_row(row)
+
+
+def read_chunks(csv_reader, chunk_size):
+    # Generator: yield lists of up to chunk_size rows.
+    while True:
+        chunk = list(islice(csv_reader, chunk_size))
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def apply_to_chunk(transform_row, chunk):
+    # Return the list of transformed rows.
+    return [transform_row(row) for row in chunk]
+
+
+def transform_chunks(csv_reader, transform_chunk, chunk_size):
+    # Generator: yield the rows transformed chunk by chunk.
+    for chunk in read_chunks(csv_reader, chunk_size):
+        yield from transform_chunk(chunk)
+
+
+def transform_rows_parallel(csv_reader, transform_chunk, workers, chunk_size):
+    # Generator: yield the transformed rows in their original order.
+    # Only a few chunks per worker are in progress at a time,
+    # so memory use does not depend on the size of the file.
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in read_chunks(csv_reader, chunk_size):
+            pending.append(
+                executor.submit(transform_chunk, chunk)
+            )
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def process_csv(
+    csvfile_path,
+    label,
+    transform_row,
+    workers=1,
+    chunk_size=CHUNK_SIZE,
+    transform_chunk=None,
+):
+    """Transform all rows of a CSV file and replace it atomically.
+
+    Positional arguments:
+        csvfile_path -- str: Path of the CSV file exported by Aeon Timeline.
+        label -- str: Name of the column set by transform_row.
+        transform_row -- function taking a row dictionary and returning it.
+
+    Optional arguments:
+        workers -- int: Number of worker processes. 
+                   Default: 1 (no worker processes). 
+                   None: number of processors.
+        chunk_size -- int: Number of rows passed to a worker process at a time.
+        transform_chunk -- function taking a list of row dictionaries 
+                           and returning them. If given, it is used
+                           instead of transform_row for batch processing.
+
+    For parallel processing, the functions must be module level functions.
+
+    The output is quoted like the Aeon Timeline CSV import expects.
+    The file permissions are kept.
+    If anything goes wrong, the original file is left untouched.
+    """
+    dir_path = os.path.dirname(os.path.abspath(csvfile_path))
+    fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=dir_path)
+    try:
+        with open(fd, 'w', encoding='utf-8', newline='') as temp_file:
+            with open(csvfile_path, 'r', encoding='utf-8', newline='') as csvfile:
+                csv_reader = csv.DictReader(csvfile)
+                if csv_reader.fieldnames is not None:
+                    csv_writer = csv.DictWriter(
+                        temp_file,
+                        get_fieldnames(csv_reader.fieldnames, label),
+                        quoting=csv.QUOTE_ALL,
+                    )
+                    csv_writer.writeheader()
+                    if workers != 1:
+                        if transform_chunk is None:
+                            transform_chunk = partial(
+                                apply_to_chunk,
+                                transform_row,
+                            )
+                        rows = transform_rows_parallel(
+                            csv_reader,
+                            transform_chunk,
+                            workers,
+                            chunk_size,
+                        )
+                    elif transform_chunk is not None:
+                        rows = transform_chunks(
+                            csv_reader,
+                            transform_chunk,
+                            chunk_size,
+                        )
+                    else:
+                        rows = transform_rows(csv_reader, transform_row)
+                    csv_writer.writerows(rows)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        # mkstemp() creates the file with mode 0600; keep the original mode.
+        shutil.copymode(csvfile_path, temp_path)
+        os.replace(temp_path, csvfile_path)
+    except:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
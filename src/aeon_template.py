@@ -0,0 +1,261 @@
+"""Edit and write Aeon Timeline 2 XML templates with large era tables.
+
+The Template class loads a template once and indexes its calendars,
+so that eras can be filtered, replaced, and inserted in bulk,
+each in linear time.
+
+When writing, the template is pretty-printed like ElementTree.indent() does,
+but new eras are not built as elements.
+They are formatted one by one and streamed to the file,
+so memory use does not grow with the number of eras.
+
+Usage:
+
+    template = Template(templatePath)
+    template.filter_eras(keep)
+    template.write(newTemplate, eras)
+
+Copyright (c) 2026 Peter Triesberger
+https://github.com/peter88213/paeon
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from itertools import chain
+from xml.sax.saxutils import escape
+import xml.etree.ElementTree as ET
+
+XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+INDENT = '  '
+ERAS_PLACEHOLDER = 'ErasPlaceholder'
+
+
+class Template:
+    """Aeon Timeline 2 XML template with lookup tables.
+
+    Public instance variables:
+        xmlTree -- ElementTree of the template.
+        calendars -- dict: Calendar elements by range property GUID.
+        dateGuid -- str: GUID of the first range property with a calendar, or None.
+
+    Methods taking an optional calendar GUID use dateGuid by default.
+    """
+
+    def __init__(self, filePath):
+        """Read the template and build the lookup tables.
+
+        Positional arguments:
+            filePath -- str: Path of the .xml template file.
+        """
+        self.xmlTree = ET.parse(filePath)
+        self.calendars = {}
+        self.dateGuid = None
+        self._calendarGuids = {}
+        for xmlRangeProperty in self.xmlTree.getroot().iterfind('RangeProperties/RangeProperty'):
+            xmlCalendar = xmlRangeProperty.find('Calendar')
+            if xmlCalendar is None:
+                continue
+
+            guid = xmlRangeProperty.findtext('GUID')
+            self.calendars[guid] = xmlCalendar
+            self._calendarGuids.setdefault(xmlRangeProperty.findtext('Name'), guid)
+            if self.dateGuid is None:
+                self.dateGuid = guid
+
+    def get_calendar_guid(self, name):
+        """Return the GUID of the range property with the given name, or None."""
+        return self._calendarGuids.get(name, None)
+
+    def get_eras(self, guid=None):
+        """Return the list of Era elements of a calendar."""
+        xmlEras = self._get_eras_element(guid)
+        if xmlEras is None:
+            return []
+
+        return xmlEras.findall('Era')
+
+    def filter_eras(self, keep, guid=None):
+        """Remove all eras of a calendar for which keep(xmlEra) is False.
+
+        The remaining eras are renumbered.
+        """
+        xmlEras = self._get_eras_element(guid)
+        if xmlEras is None:
+            return
+
+        xmlEras[:] = [xmlEra for xmlEra in xmlEras if xmlEra.tag != 'Era' or keep(xmlEra)]
+        self._renumber(xmlEras)
+
+    def replace_eras(self, eras, guid=None):
+        """Replace all eras of a calendar.
+
+        Positional arguments:
+            eras -- iterable of (name, shortName, duration) tuples.
+
+        The new eras take the place of the first old era.
+        Other child elements of the calendar's Eras element stay in place.
+        """
+        newEras = [get_era_element(name, shortName, index, duration)
+                   for index, (name, shortName, duration) in enumerate(eras)]
+        xmlEras = self._get_eras_element(guid, create=bool(newEras))
+        if xmlEras is None:
+            return
+
+        children = []
+        for child in xmlEras:
+            if child.tag != 'Era':
+                children.append(child)
+            elif newEras:
+                children.extend(newEras)
+                newEras = None
+        if newEras:
+            children.extend(newEras)
+        xmlEras[:] = children
+
+    def insert_eras(self, position, eras, guid=None):
+        """Insert eras into a calendar.
+
+        Positional arguments:
+            position -- int: Number of the era before which the new eras are inserted.
+            eras -- iterable of (name, shortName, duration) tuples.
+
+        Other child elements of the calendar's Eras element stay in place.
+        All eras are renumbered.
+        """
+        newEras = [get_era_element(name, shortName, 0, duration)
+                   for name, shortName, duration in eras]
+        if not newEras:
+            return
+
+        xmlEras = self._get_eras_element(guid, create=True)
+        children = list(xmlEras)
+        eraIndexes = [index for index, child in enumerate(children) if child.tag == 'Era']
+        position, __, __ = slice(position, position).indices(len(eraIndexes))
+        if position < len(eraIndexes):
+            childIndex = eraIndexes[position]
+        elif eraIndexes:
+            childIndex = eraIndexes[-1] + 1
+        else:
+            childIndex = len(children)
+        children[childIndex:childIndex] = newEras
+        xmlEras[:] = children
+        self._renumber(xmlEras)
+
+    def write(self, filePath, eras=(), guid=None):
+        """Write the template, with new eras appended to a calendar.
+
+        Positional arguments:
+            filePath -- str: Path of the template file to write.
+
+        Optional arguments:
+            eras -- iterable of (name, shortName, duration) tuples; may be a generator.
+
+        A calendar without an Eras element gets one only if there are eras to append.
+        See write_template().
+        """
+        xmlEras = self._get_eras_element(guid)
+        if xmlEras is None:
+            eras = iter(eras)
+            firstEra = next(eras, None)
+            if firstEra is None:
+                ET.indent(self.xmlTree)
+                with open(filePath, 'w', encoding='utf-8') as f:
+                    f.write(XML_DECLARATION)
+                    f.write(ET.tostring(self.xmlTree.getroot(), encoding='unicode'))
+                return
+
+            eras = chain((firstEra,), eras)
+            xmlEras = self._get_eras_element(guid, create=True)
+        write_template(self.xmlTree, xmlEras, eras, filePath, len(xmlEras.findall('Era')))
+
+    def _get_eras_element(self, guid, create=False):
+        if guid is None:
+            guid = self.dateGuid
+        xmlCalendar = self.calendars[guid]
+        xmlEras = xmlCalendar.find('Eras')
+        if xmlEras is None and create:
+            xmlEras = ET.SubElement(xmlCalendar, 'Eras')
+        return xmlEras
+
+    def _renumber(self, xmlEras):
+        for index, xmlEra in enumerate(xmlEras.iterfind('Era')):
+            xmlIndex = xmlEra.find('Index')
+            if xmlIndex is None:
+                xmlIndex = ET.SubElement(xmlEra, 'Index')
+            xmlIndex.text = str(index)
+
+
+def get_era_element(name, shortName, index, duration):
+    """Return a new Era element.
+
+    Positional arguments:
+        name -- str: Era name.
+        shortName -- str: Era short name.
+        index -- int: Era index.
+        duration -- int: Era duration in years.
+    """
+    xmlEra = ET.Element('Era')
+    ET.SubElement(xmlEra, 'Name').text = name
+    ET.SubElement(xmlEra, 'ShortName').text = shortName
+    ET.SubElement(xmlEra, 'Index').text = str(index)
+    ET.SubElement(xmlEra, 'Duration').text = str(duration)
+    ET.SubElement(xmlEra, 'IsBackwards').text = '0'
+    ET.SubElement(xmlEra, 'HasLeapYears').text = '0'
+    return xmlEra
+
+
+def get_era_xml(name, shortName, index, duration, indent):
+    """Return an Era element as pretty-printed XML text.
+
+    Positional arguments:
+        name -- str: Era name.
+        shortName -- str: Era short name.
+        index -- int: Era index.
+        duration -- int: Era duration in years.
+        indent -- str: Indentation of the Era element.
+    """
+    childIndent = f'\n{indent}{INDENT}'
+    return (
+        f'<Era>{childIndent}<Name>{escape(name)}</Name>'
+        f'{childIndent}<ShortName>{escape(shortName)}</ShortName>'
+        f'{childIndent}<Index>{index}</Index>'
+        f'{childIndent}<Duration>{duration}</Duration>'
+        f'{childIndent}<IsBackwards>0</IsBackwards>'
+        f'{childIndent}<HasLeapYears>0</HasLeapYears>'
+        f'\n{indent}</Era>'
+    )
+
+
+def write_template(xmlTree, xmlEras, eras, filePath, startIndex=1):
+    """Write the template with new eras appended to an Eras element.
+
+    Positional arguments:
+        xmlTree -- ElementTree of the template.
+        xmlEras -- Eras element of the calendar to extend.
+        eras -- iterable of (name, shortName, duration) tuples; may be a generator.
+        filePath -- str: Path of the template file to write.
+
+    Optional arguments:
+        startIndex -- int: Index of the first new era.
+
+    The output is the same as if the eras were added as elements
+    and the tree was written after ElementTree.indent().
+    The tree is indented, but no eras are added to it.
+    """
+    placeholder = ET.SubElement(xmlEras, ERAS_PLACEHOLDER)
+    try:
+        ET.indent(xmlTree)
+        xmlText = ET.tostring(xmlTree.getroot(), encoding='unicode')
+    finally:
+        xmlEras.remove(placeholder)
+    head, tail = xmlText.split(f'<{ERAS_PLACEHOLDER} />', 1)
+    indent = head[head.rfind('\n') + 1:]
+    separator = f'\n{indent}'
+    with open(filePath, 'w', encoding='utf-8') as f:
+        f.write(XML_DECLARATION)
+        f.write(head)
+        index = startIndex
+        for name, shortName, duration in eras:
+            if index > startIndex:
+                f.write(separator)
+            f.write(get_era_xml(name, shortName, index, duration, indent))
+            index += 1
+        f.write(tail)
@@ -0,0 +1,320 @@
+"""Provide indexed views of Aeon Timeline 2 and Aeon Timeline 3 timeline data.
+
+The lookup tables are built once at load time, so that bulk edits
+of event properties run in O(events) instead of O(events x properties).
+
+Usage:
+
+    timeline = Timeline(jsonData)  # Aeon 2; Timeline3(jsonData) for Aeon 3
+    propertyGuid = timeline.get_property_guid('Moon phase')
+    for evt in timeline.events:
+        timestamp = timeline.get_timestamp(evt)
+        timeline.set_value(evt, propertyGuid, value)
+
+Copyright (c) 2026 Peter Triesberger
+https://github.com/peter88213/paeon
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+
+from functools import lru_cache
+
+START_DATE = 'startDate'
+SECONDS_PER_DAY = 86400
+DATE_CACHE_SIZE = 0x10000
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def get_day_date(dayNumber):
+    """Return a (year, month, day) tuple for a day number.
+
+    Positional arguments:
+        dayNumber -- int: Days since 0001-01-01 (proleptic Gregorian calendar).
+
+    Years are numbered astronomically: year 0 is 1 BC, year -1 is 2 BC, and so on.
+    This is Howard Hinnant's civil_from_days algorithm; 
+    it works with integers only, and for negative day numbers as well.
+    """
+    z = dayNumber + 306
+    # days since 0000-03-01
+    era = z // 146097
+    dayOfEra = z - era * 146097
+    yearOfEra = (dayOfEra - dayOfEra // 1460 + dayOfEra // 36524 - dayOfEra // 146096) // 365
+    dayOfYear = dayOfEra - (365 * yearOfEra + yearOfEra // 4 - yearOfEra // 100)
+    mp = (5 * dayOfYear + 2) // 153
+    day = dayOfYear - (153 * mp + 2) // 5 + 1
+    if mp < 10:
+        month = mp + 3
+    else:
+        month = mp - 9
+    year = yearOfEra + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def get_date(timestamp):
+    """Return a (year, month, day) tuple for an Aeon timestamp.
+
+    Positional arguments:
+        timestamp -- int: Seconds since 0001-01-01 00:00; negative for BC dates.
+
+    See get_day_date().
+    """
+    return get_day_date(int(timestamp // SECONDS_PER_DAY))
+
+
+class Timeline:
+    """Aeon Timeline 2 timeline structure with lookup tables.
+
+    Public instance variables:
+        jsonData -- Python object containing the timeline structure.
+        events -- list of event dictionaries.
+        properties -- dict: Property dictionaries by GUID.
+        rangeProperties -- dict: Range property dictionaries by GUID.
+        calendars -- dict: Calendar definitions by date range property GUID, in template order.
+        eras -- dict: For each date range property GUID, the calendar eras by name.
+        dateGuid -- str: GUID of the date range property with an "AD" era, or None.
+    """
+
+    def __init__(self, jsonData):
+        """Build the lookup tables.
+
+        Positional arguments:
+            jsonData -- Python object containing the timeline structure.
+        """
+        self.jsonData = jsonData
+        template = jsonData['template']
+
+        self.properties = {}
+        self._propertyGuids = {}
+        for tplPrp in template['properties']:
+            self._add_property_index(tplPrp)
+
+        self.rangeProperties = {}
+        self.calendars = {}
+        self.eras = {}
+        self.dateGuid = None
+        for tplRgp in template['rangeProperties']:
+            self.rangeProperties[tplRgp['guid']] = tplRgp
+            if tplRgp['type'] != 'date':
+                continue
+
+            self.calendars[tplRgp['guid']] = tplRgp['calendar']
+            eras = {}
+            for tplRgpCalEra in tplRgp['calendar']['eras']:
+                eras[tplRgpCalEra['name']] = tplRgpCalEra
+            self.eras[tplRgp['guid']] = eras
+            if self.dateGuid is None and 'AD' in eras:
+                self.dateGuid = tplRgp['guid']
+
+        self.events = jsonData['events']
+        self._values = {}
+        self._rangeValues = {}
+        for evt in self.events:
+            values = {}
+            for evtVal in evt['values']:
+                values.setdefault(evtVal['property'], evtVal)
+            self._values[evt['guid']] = values
+            rangeValues = {}
+            for evtRgv in evt['rangeValues']:
+                rangeValues[evtRgv['rangeProperty']] = evtRgv
+            self._rangeValues[evt['guid']] = rangeValues
+
+    def get_property_guid(self, name):
+        """Return the GUID of the property with the given name, or None."""
+        return self._propertyGuids.get(name, None)
+
+    def add_property(self, name, guid):
+        """Add a text property to the template and return its GUID.
+
+        Positional arguments:
+            name -- str: Property name.
+            guid -- str: GUID of the new property.
+        """
+        tplPrp = {
+            'calcMode': 'default',
+            'calculate': False,
+            'fadeEvents': False,
+            'guid': guid,
+            'icon': 'flag',
+            'isMandatory': False,
+            'name': name,
+            'sortOrder': len(self.jsonData['template']['properties']),
+            'type': 'text'
+        }
+        self.jsonData['template']['properties'].append(tplPrp)
+        self._add_property_index(tplPrp)
+        return guid
+
+    def get_timestamp(self, evt, rangePropertyGuid=None):
+        """Return the event's start timestamp in seconds, or None.
+
+        Positional arguments:
+            evt -- event dictionary.
+
+        Optional arguments:
+            rangePropertyGuid -- str: GUID of the range property. Default: dateGuid.
+        """
+        if rangePropertyGuid is None:
+            rangePropertyGuid = self.dateGuid
+        evtRgv = self._rangeValues[evt['guid']].get(rangePropertyGuid, None)
+        if evtRgv is None:
+            return None
+
+        return evtRgv['position'].get('timestamp', None)
+
+    def get_value(self, evt, propertyGuid):
+        """Return the event's value of the given property, or None."""
+        evtVal = self._values[evt['guid']].get(propertyGuid, None)
+        if evtVal is None:
+            return None
+
+        return evtVal['value']
+
+    def set_value(self, evt, propertyGuid, value):
+        """Set the event's value of the given property.
+
+        Positional arguments:
+            evt -- event dictionary.
+            propertyGuid -- str: GUID of the property.
+            value -- str: New value.
+
+        Add the value to the event, if missing.
+        Return True if the value has changed.
+        """
+        values = self._values[evt['guid']]
+        evtVal = values.get(propertyGuid, None)
+        if evtVal is None:
+            evtVal = {'property': propertyGuid, 'value': value}
+            evt['values'].append(evtVal)
+            values[propertyGuid] = evtVal
+            return True
+
+        if evtVal['value'] == value:
+            return False
+
+        evtVal['value'] = value
+        return True
+
+    def _add_property_index(self, tplPrp):
+        self.properties[tplPrp['guid']] = tplPrp
+        self._propertyGuids.setdefault(tplPrp['name'], tplPrp['guid'])
+
+
+class Timeline3:
+    """Aeon Timeline 3 timeline structure with lookup tables.
+
+    Provides the same interface as Timeline.
+    The events are the items of all types that can have a date.
+    The items' start date takes the part of the Aeon 2 date range property;
+    its key is START_DATE.
+
+    Public instance variables:
+        jsonData -- Python object containing the timeline structure.
+        events -- list of item dictionaries.
+        properties -- dict: Property dictionaries by ID.
+        rangeProperties -- dict: Empty; Aeon 3 has no range properties.
+        calendars -- dict: For START_DATE, the calendar definition.
+        eras -- dict: For START_DATE, the calendar eras by name.
+        dateGuid -- str: START_DATE, if the calendar has an "AD" era, or None.
+    """
+
+    def __init__(self, jsonData):
+        """Build the lookup tables.
+
+        Positional arguments:
+            jsonData -- Python object containing the timeline structure.
+        """
+        self.jsonData = jsonData
+        definitions = jsonData['definitions']
+
+        self.properties = {}
+        self._propertyGuids = {}
+        for propertyId in definitions['properties']['allIds']:
+            self._add_property_index(definitions['properties']['byId'][propertyId])
+
+        self.rangeProperties = {}
+        self.calendars = {START_DATE: definitions['calendar']}
+        eras = {}
+        for calEra in definitions['calendar']['eras']:
+            eras[calEra['name']] = calEra
+        self.eras = {START_DATE: eras}
+        if 'AD' in eras:
+            self.dateGuid = START_DATE
+        else:
+            self.dateGuid = None
+
+        datedTypes = set()
+        for typeId, itemType in definitions['types']['byId'].items():
+            if itemType.get('canHaveDate', False):
+                datedTypes.add(typeId)
+        items = jsonData['data']['items']
+        self.events = []
+        for itemId in items['allIds']:
+            item = items['byId'][itemId]
+            if item['type'] in datedTypes:
+                self.events.append(item)
+
+    def get_property_guid(self, name):
+        """Return the ID of the property with the given name, or None."""
+        return self._propertyGuids.get(name, None)
+
+    def add_property(self, name, guid):
+        """Add a text property to the definitions and return its ID.
+
+        Positional arguments:
+            name -- str: Property name.
+            guid -- str: ID of the new property.
+        """
+        prp = {
+            'enabled': True,
+            'canDelete': True,
+            'id': guid,
+            'key': None,
+            'label': name,
+            'format': 'text',
+            'allowed': [],
+            'multiple': False,
+            'autoCalculate': False,
+            'autoCalculateType': None,
+            'indicateItemCompletion': False
+        }
+        properties = self.jsonData['definitions']['properties']
+        properties['allIds'].append(guid)
+        properties['byId'][guid] = prp
+        self._add_property_index(prp)
+        return guid
+
+    def get_timestamp(self, evt, rangePropertyGuid=None):
+        """Return the item's start timestamp in seconds, or None."""
+        startDate = evt.get(START_DATE, None)
+        if not startDate:
+            return None
+
+        return startDate.get('timestamp', None)
+
+    def get_value(self, evt, propertyGuid):
+        """Return the item's value of the given property, or None."""
+        return evt['propertyValues'].get(propertyGuid, None)
+
+    def set_value(self, evt, propertyGuid, value):
+        """Set the item's value of the given property.
+
+        Positional arguments:
+            evt -- item dictionary.
+            propertyGuid -- str: ID of the property.
+            value -- str: New value. An empty value is removed.
+
+        Return True if the value has changed.
+        """
+        propertyValues = evt['propertyValues']
+        if not value:
+            return propertyValues.pop(propertyGuid, None) is not None
+
+        if propertyValues.get(propertyGuid, None) == value:
+            return False
+
+        propertyValues[propertyGuid] = value
+        return True
+
+    def _add_property_index(self, prp):
+        self.properties[prp['id']] = prp
+        self._propertyGuids.setdefault(prp['label'], prp['id'])
@@ -1,12 +1,26 @@
 """Calculate alternate start dates for Aeon Timeline.
 
 Requires Python 3.7+
+Requires aeon_csv.py, panchanga.py, aeon2moon.py, aeon_timeline.py, and extract_json.py in the same directory.
 
-1. Read CSV file exported by Aeon Timeline.
+Calculates the Panchanga date at the start date/time: 
+lunar month (amanta), tithi, and nakshatra, e.g. "Chaitra, Shukla Pratipada, Ashwini".
+The start time is taken as Universal Time.
+
+1. Read CSV file exported by Aeon Timeline row by row.
 2. Calculate and fill in alternate dates.
 3. Update the CSV file for Aeon Timeline import.
+   The file is replaced only after the update has been completely written.
+
+Alternatively, pass an Aeon Timeline 2 .aeonzip or Aeon Timeline 3 .aeon file. 
+Then the alternate dates are written into an event property; 
+the previous file is kept as a ".bak" file.
 
-Usage: alt_date.py path-to-csv-file
+Usage: alt_date.py [-h] [-w WORKERS] path-to-csv-or-aeon-file
+
+  -w WORKERS, --workers WORKERS
+        Number of worker processes for large files. 
+        Default: 1 (no worker processes). 0: number of processors.
 
 This also works via dragging/dropping the csv file onto the script's icon.
 
@@ -15,74 +29,83 @@ https://github.com/peter88213/paeon
 Published under the MIT License 
 (https://opensource.org/licenses/mit-license.php)
 """
-import sys
-import csv
-from datetime import datetime
+import argparse
+
+from aeon2moon import AEON2_EXT
+from aeon2moon import AEON3_EXT
+from aeon2moon import enrich
+from aeon_csv import parse_start_date
+from aeon_csv import process_csv
+from panchanga import JD_EPOCH
+from panchanga import get_julian_day
+from panchanga import get_panchanga_date
+from panchanga import get_panchanga_dates
 
 ALTERNATE_DATE_TIME_LABEL = 'Panchanga Date'
+SECONDS_PER_DAY = 86400
 
 
 def calculate_alternate_date(dt_str):
-    # Calculate the alternate date from the iso 6801:2004 date/time string.
-
-    return dt_str
-
-
-def main(csvfile_path):
-    aeon_data = read_csv(csvfile_path)
-    for row in aeon_data:
-        dt_str = (row['Start Date'])
-        try:
-            row[ALTERNATE_DATE_TIME_LABEL] = calculate_alternate_date(
-                convert_bc_to_iso_6801(dt_str)
-            )
-        except:
-            pass
-    write_csv(csvfile_path, aeon_data)
-
-
-def read_csv(csvfile_path):
-    aeon_data = []
-    with open(csvfile_path, 'r', encoding='utf-8', newline='') as csvfile:
-        csv_reader = csv.DictReader(csvfile)
-        for row in csv_reader:
-            aeon_data.append(row)
-    return aeon_data
-
-
-def write_csv(csvfile_path, aeon_data):
-    with open(csvfile_path, 'w', encoding='utf-8', newline='') as csvfile:
-        csv_writer = csv.DictWriter(
-            csvfile,
-            list(aeon_data[0]),
-            quoting=csv.QUOTE_ALL,
-        )
-        csv_writer.writeheader()
-        for row in aeon_data:
-            csv_writer.writerow(row)
-
-
-def convert_bc_to_iso_6801(dt_str):
-    # Return dt_str with negative date or year zero, if applicable.
-    if not dt_str.startswith('BC'):
-        return dt_str
-
-    # Convert "BC" year to negative year, starting with zero.
-    dt_split = dt_str.split(' ')
-    date_str = dt_split[1]
-    dt = datetime.fromisoformat(date_str)
-    year = -1 * (dt.year - 1)
-    iso_6801_dt_str = '-'.join([
-        str(year).zfill(4),
-        str(dt.month).zfill(2),
-        str(dt.day).zfill(2)
-    ])
-    try:
-        iso_6801_dt_str = f'{iso_6801_dt_str} {dt_split[2]}'
-    except:
-        pass
-    return iso_6801_dt_str
+    # Calculate the alternate date from the Aeon Timeline date/time string.
+    # The time is taken as Universal Time; a missing time means midnight.
+    start_date = parse_start_date(dt_str)
+    if start_date is None:
+        return ''
+
+    year, month, day, hour, minute, second = start_date
+    if hour is None:
+        hour = minute = second = 0
+    return get_panchanga_date(
+        get_julian_day(year, month, day, hour, minute, second)
+    )
+
+
+class AlternateDateCalculator:
+    # Calculate the alternate date event property for aeon2moon.enrich().
+
+    def __init__(self):
+        self.propertyName = ALTERNATE_DATE_TIME_LABEL
+        self.guidSeed = 'propertyPanchangaDateGuid'
+
+    def calculate(self, timestamps):
+        return get_panchanga_dates([
+            None if timestamp is None
+            else JD_EPOCH + timestamp / SECONDS_PER_DAY
+            for timestamp in timestamps
+        ])
+
+
+def main(csvfile_path, workers=1):
+    if csvfile_path.endswith((AEON2_EXT, AEON3_EXT)):
+        # Write the event property directly into the timeline file.
+        print(enrich(csvfile_path, [AlternateDateCalculator()]))
+        return
+
+    process_csv(
+        csvfile_path,
+        ALTERNATE_DATE_TIME_LABEL,
+        transform_row,
+        workers=workers,
+    )
+
+
+def transform_row(row):
+    # Set the alternate date/time column of a CSV row; return the row.
+    row[ALTERNATE_DATE_TIME_LABEL] = calculate_alternate_date(row['Start Date'])
+    return row
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    parser = argparse.ArgumentParser(
+        description=f'Calculate the "{ALTERNATE_DATE_TIME_LABEL}" column of an Aeon Timeline CSV export or timeline file.'
+    )
+    parser.add_argument('csvfile_path', metavar='path-to-csv-or-aeon-file')
+    parser.add_argument(
+        '-w', '--workers', type=int, default=1,
+        help=(
+            'Number of worker processes for large files. '
+            'Default: 1 (no worker processes). 0: number of processors.'
+        )
+    )
+    args = parser.parse_args()
+    main(args.csvfile_path, args.workers or None)
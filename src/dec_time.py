@@ -1,15 +1,28 @@
 """Calculate alternate start times for Aeon Timeline.
 
 Requires Python 3.7+
+Requires aeon_csv.py, aeon2moon.py, aeon_timeline.py, and extract_json.py in the same directory.
 
 Calculates the start time based on the decimal system: 
 100 ticks to a minim,  10 minims to an interval, 10 intervals to a day.
 
-1. Read CSV file exported by Aeon Timeline.
+1. Read CSV file exported by Aeon Timeline row by row.
 2. Calculate and fill in alternate dates.
 3. Update the CSV file for Aeon Timeline import.
+   The file is replaced only after the update has been completely written.
 
-Usage: dec_time.py path-to-csv-file
+Alternatively, pass an Aeon Timeline 2 .aeonzip or Aeon Timeline 3 .aeon file. 
+Then the alternate dates are written into an event property; 
+the previous file is kept as a ".bak" file.
+
+If NumPy is installed, the decimal times are calculated column-wise 
+with vectorized operations. Otherwise, they are calculated row by row.
+
+Usage: dec_time.py [-h] [-w WORKERS] path-to-csv-or-aeon-file
+
+  -w WORKERS, --workers WORKERS
+        Number of worker processes for large files. 
+        Default: 1 (no worker processes). 0: number of processors.
 
 This also works via dragging/dropping the csv file onto the script's icon.
 
@@ -18,90 +31,137 @@ https://github.com/peter88213/paeon
 Published under the MIT License 
 (https://opensource.org/licenses/mit-license.php)
 """
-import sys
-import csv
-from datetime import time
-from datetime import datetime
+import argparse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from aeon2moon import AEON2_EXT
+from aeon2moon import AEON3_EXT
+from aeon2moon import enrich
+from aeon_csv import parse_start_date
+from aeon_csv import process_csv
 
 ALTERNATE_DATE_TIME_LABEL = 'Decimal Time'
+SECONDS_PER_DAY = 86400
 
 
 def calculate_alternate_date(dt_str):
-    # Calculate the alternate date from the iso 6801:2004 date/time string.
-    dt = dt_str.split(' ')
-    for timestring in dt:
-        if ':' in timestring:
-            try:
-                timeobj = time.fromisoformat(timestring)
-                seconds = (
-                    timeobj.hour * 3600 +
-                    timeobj.minute * 60 +
-                    timeobj.second
-                )
-                interval, seconds = divmod(seconds, 8640)
-                minim, seconds = divmod(seconds, 864)
-                tick = int(seconds / 8.64)
-            except:
-                return ''
-
-            return f'{interval:02}:{minim:02}:{tick:02}'
-
-
-def main(csvfile_path):
-    aeon_data = read_csv(csvfile_path)
-    for row in aeon_data:
-        dt_str = (row['Start Date'])
-        try:
-            row[ALTERNATE_DATE_TIME_LABEL] = calculate_alternate_date(
-                convert_bc_to_iso_6801(dt_str)
-            )
-        except:
-            pass
-    write_csv(csvfile_path, aeon_data)
-
-
-def read_csv(csvfile_path):
-    aeon_data = []
-    with open(csvfile_path, 'r', encoding='utf-8', newline='') as csvfile:
-        csv_reader = csv.DictReader(csvfile)
-        for row in csv_reader:
-            aeon_data.append(row)
-    return aeon_data
-
-
-def write_csv(csvfile_path, aeon_data):
-    with open(csvfile_path, 'w', encoding='utf-8', newline='') as csvfile:
-        csv_writer = csv.DictWriter(
-            csvfile,
-            list(aeon_data[0]),
-            quoting=csv.QUOTE_ALL,
+    # Calculate the alternate time from the Aeon Timeline date/time string.
+    start_date = parse_start_date(dt_str)
+    if start_date is None or start_date[3] is None:
+        return ''
+
+    __, __, __, hour, minute, second = start_date
+    return get_decimal_time(hour * 3600 + minute * 60 + second)
+
+
+def calculate_alternate_dates(dt_strs):
+    # Calculate the alternate times for a column of date/time strings.
+    seconds = []
+    for dt_str in dt_strs:
+        start_date = parse_start_date(dt_str)
+        if start_date is None or start_date[3] is None:
+            seconds.append(-1)
+        else:
+            __, __, __, hour, minute, second = start_date
+            seconds.append(hour * 3600 + minute * 60 + second)
+    return get_decimal_times(seconds)
+
+
+def get_decimal_time(seconds):
+    # Return the decimal time string for the seconds since midnight.
+    interval, seconds = divmod(seconds, 8640)
+    minim, seconds = divmod(seconds, 864)
+    tick = int(seconds / 8.64)
+    return f'{interval:02}:{minim:02}:{tick:02}'
+
+
+def get_decimal_times(seconds):
+    # Return a list of decimal time strings for a sequence of seconds since midnight.
+    # Negative seconds result in empty strings.
+    if np is None:
+        return [
+            get_decimal_time(value) if value >= 0 else ''
+            for value in seconds
+        ]
+
+    # Each distinct time is calculated and formatted only once.
+    values, inverse = np.unique(
+        np.asarray(seconds, dtype=np.int64),
+        return_inverse=True,
+    )
+    interval, rest = np.divmod(values, 8640)
+    minim, rest = np.divmod(rest, 864)
+    tick = (rest / 8.64).astype(np.int64)
+    strings = [
+        f'{i:02}:{m:02}:{t:02}' if value >= 0 else ''
+        for value, i, m, t in zip(
+            values.tolist(),
+            interval.tolist(),
+            minim.tolist(),
+            tick.tolist(),
         )
-        csv_writer.writeheader()
-        for row in aeon_data:
-            csv_writer.writerow(row)
-
-
-def convert_bc_to_iso_6801(dt_str):
-    # Return dt_str with negative date or year zero, if applicable.
-    if not dt_str.startswith('BC'):
-        return dt_str
-
-    # Convert "BC" year to negative year, starting with zero.
-    dt_split = dt_str.split(' ')
-    date_str = dt_split[1]
-    dt = datetime.fromisoformat(date_str)
-    year = -1 * (dt.year - 1)
-    iso_6801_dt_str = '-'.join([
-        str(year).zfill(4),
-        str(dt.month).zfill(2),
-        str(dt.day).zfill(2)
-    ])
-    try:
-        iso_6801_dt_str = f'{iso_6801_dt_str} {dt_split[2]}'
-    except:
-        pass
-    return iso_6801_dt_str
+    ]
+    return [strings[index] for index in inverse.tolist()]
+
+
+class DecimalTimeCalculator:
+    # Calculate the "Decimal Time" event property for aeon2moon.enrich().
+
+    def __init__(self):
+        self.propertyName = ALTERNATE_DATE_TIME_LABEL
+        self.guidSeed = 'propertyDecimalTimeGuid'
+
+    def calculate(self, timestamps):
+        return get_decimal_times([
+            -1 if timestamp is None else int(timestamp % SECONDS_PER_DAY)
+            for timestamp in timestamps
+        ])
+
+
+def main(csvfile_path, workers=1):
+    if csvfile_path.endswith((AEON2_EXT, AEON3_EXT)):
+        # Write the event property directly into the timeline file.
+        print(enrich(csvfile_path, [DecimalTimeCalculator()]))
+        return
+
+    process_csv(
+        csvfile_path,
+        ALTERNATE_DATE_TIME_LABEL,
+        transform_row,
+        workers=workers,
+        transform_chunk=transform_chunk,
+    )
+
+
+def transform_row(row):
+    # Set the alternate date/time column of a CSV row; return the row.
+    row[ALTERNATE_DATE_TIME_LABEL] = calculate_alternate_date(row['Start Date'])
+    return row
+
+
+def transform_chunk(rows):
+    # Set the alternate date/time column of a list of CSV rows; return the rows.
+    values = calculate_alternate_dates([row['Start Date'] for row in rows])
+    for row, value in zip(rows, values):
+        row[ALTERNATE_DATE_TIME_LABEL] = value
+    return rows
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    parser = argparse.ArgumentParser(
+        description=f'Calculate the "{ALTERNATE_DATE_TIME_LABEL}" column of an Aeon Timeline CSV export or timeline file.'
+    )
+    parser.add_argument('csvfile_path', metavar='path-to-csv-or-aeon-file')
+    parser.add_argument(
+        '-w', '--workers', type=int, default=1,
+        help=(
+            'Number of worker processes for large files. '
+            'Default: 1 (no worker processes). 0: number of processors.'
+        )
+    )
+    args = parser.parse_args()
+    main(args.csvfile_path, args.workers or None)
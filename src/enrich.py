@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""Aeon Timeline 2/3 Add/update calculated properties at event start date.
+
+Requires Python 3.7+
+Requires aeon2moon.py, aeon_timeline.py, extract_json.py, aeon_csv.py, alt_date.py, panchanga.py,
+dec_time.py, zodiac.py, zodiac_calendar.py, and aeon_template.py in the same directory.
+
+usage: enrich.py [-h] [-m] [-d] [-z] [-a] [-e {conway,meeus}] [-l {0..9}] [--no-backup] Sourcefile
+
+positional arguments:
+  Sourcefile            The path of the .aeonzip or .aeon file.
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -m, --moon            Add/update the "Moon phase" event property.
+  -d, --decimal-time    Add/update the "Decimal Time" event property.
+  -z, --zodiac          Add/update the "Zodiac" event property.
+  -a, --alternate-date  Add/update the "Panchanga Date" event property.
+  -e {conway,meeus}, --engine {conway,meeus}
+                        Moon phase calculation. Default: conway.
+  -l {0..9}, --level {0..9}
+                        Compression level of the timeline data. Default: zlib default.
+  --no-backup           Do not keep the previous file as a ".bak" file.
+
+All selected properties are calculated in one pass; the file is read and written only once.
+
+Copyright (c) 2026 Peter Triesberger
+https://github.com/peter88213/paeon
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+
+from aeon2moon import ENGINE_CONWAY
+from aeon2moon import ENGINE_MEEUS
+from aeon2moon import ERROR
+from aeon2moon import MoonPhaseCalculator
+from aeon2moon import enrich
+from alt_date import AlternateDateCalculator
+from dec_time import DecimalTimeCalculator
+from zodiac import ZodiacCalculator
+
+
+def run(filePath, moon=False, decimalTime=False, zodiac=False, alternateDate=False,
+        engine=ENGINE_CONWAY, compressLevel=None, backup=True):
+    """Add or update the selected event properties.
+
+    Positional arguments:
+        filePath -- str: Path of the .aeonzip or .aeon file.
+
+    Optional arguments:
+        moon, decimalTime, zodiac, alternateDate -- bool: If True, add/update the property.
+        engine -- str: Moon phase calculation; ENGINE_CONWAY or ENGINE_MEEUS.
+        compressLevel -- int: Deflate compression level 0..9 (.aeonzip only). Default: zlib's default.
+        backup -- bool: If True, keep the previous file as a ".bak" file.
+
+    Return a message beginning with the ERROR constant in case of error.
+    """
+    calculators = []
+    if moon:
+        calculators.append(MoonPhaseCalculator(engine))
+    if decimalTime:
+        calculators.append(DecimalTimeCalculator())
+    if zodiac:
+        calculators.append(ZodiacCalculator())
+    if alternateDate:
+        calculators.append(AlternateDateCalculator())
+    if not calculators:
+        return f'{ERROR}No property selected.'
+
+    return enrich(filePath, calculators, compressLevel, backup)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Aeon Timeline 2/3 Add/update calculated properties at event start date',
+        epilog='All selected properties are calculated in one pass; the file is read and written only once.')
+    parser.add_argument('sourcePath', metavar='Sourcefile',
+                        help='The path of the .aeonzip or .aeon file.')
+    parser.add_argument('-m', '--moon', action='store_true',
+                        help='Add/update the "Moon phase" event property.')
+    parser.add_argument('-d', '--decimal-time', action='store_true',
+                        help='Add/update the "Decimal Time" event property.')
+    parser.add_argument('-z', '--zodiac', action='store_true',
+                        help='Add/update the "Zodiac" event property.')
+    parser.add_argument('-a', '--alternate-date', action='store_true',
+                        help='Add/update the "Panchanga Date" event property.')
+    parser.add_argument('-e', '--engine', choices=[ENGINE_CONWAY, ENGINE_MEEUS], default=ENGINE_CONWAY,
+                        help=f'Moon phase calculation. Default: {ENGINE_CONWAY}.')
+    parser.add_argument('-l', '--level', type=int, choices=range(10), default=None, metavar='{0..9}',
+                        help='Compression level of the timeline data. Default: zlib default.')
+    parser.add_argument('--no-backup', action='store_true',
+                        help='Do not keep the previous file as a ".bak" file.')
+    args = parser.parse_args()
+    print(run(args.sourcePath, args.moon, args.decimal_time, args.zodiac, args.alternate_date,
+              args.engine, args.level, not args.no_backup))
@@ -1,32 +1,56 @@
 #!/usr/bin/python3
 """Create a pretty-printed JSON file from an Aeon Timeline 2/3 file.
 
-Version 1.0.6
+Version 1.1.0
 Requires Python 3.6+
 
-usage: extract_json.py [-h] Sourcefile
+usage: extract_json.py [-h] [-w WORKERS] [-s Summaryfile] [-c Cachefile] [-f]
+                       [--cache-size CACHE_SIZE] Sourcefile [Sourcefile ...]
 
 positional arguments:
-  Sourcefile  The path of the .aeonzip or .aeon file.
+  Sourcefile            The path of the .aeonzip or .aeon file. 
+                        Batch mode: several paths, directories, or glob patterns.
 
 optional arguments:
-  -h, --help  show this help message and exit
+  -h, --help            show this help message and exit
+  -w WORKERS, --workers WORKERS
+                        Batch mode: number of worker processes (default: number of processors).
+                        0: number of processors.
+  -s Summaryfile, --summary Summaryfile
+                        Batch mode: write the JSON summary to this file instead of printing it.
+  -c Cachefile, --cache Cachefile
+                        Batch mode: skip files whose JSON part is unchanged since the last run.
+  -f, --force           Batch mode: convert all files even if the cache says they are up to date.
+  --cache-size CACHE_SIZE
+                        Batch mode: maximum number of cache entries (default: 10000).
 
 Copyright (c) 2022 Peter Triesberger
 https://github.com/peter88213/paeon
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
+import sys
+import glob
 import zipfile
 import codecs
 import json
 import argparse
+import re
+import mmap
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
 
-VERSION = 'v1.0.6'
+VERSION = 'v1.1.0'
 AEON3_EXT = '.aeon'
 AEON2_EXT = '.aeonzip'
 JSON_EXT = '.json'
 ERROR = 'Error: '
+SCAN_CHUNK_SIZE = 0x10000
+BRACKETS = re.compile(b'[{}]')
+CACHE_SIZE = 10000
+WRITE_CHUNK_SIZE = 0x10000
 
 
 def open_timeline(filePath):
@@ -48,12 +72,75 @@ def open_timeline(filePath):
         return f'{ERROR}No JSON part found in timeline data.', None
     try:
         jsonData = json.loads(jsonStr)
-    except('JSONDecodeError'):
-        return f'{ERROR}Invalid JSON data in timeline.'
-        None
+    except ValueError:
+        return f'{ERROR}Invalid JSON data in timeline.', None
+
     return 'Timeline data read in.', jsonData
 
 
+def find_json_region(buffer, chunkSize=SCAN_CHUNK_SIZE):
+    """Locate the JSON part in a binary buffer.
+
+    Positional arguments:
+        buffer -- bytes-like object: Content of an Aeon 3 project file.
+
+    Optional arguments:
+        chunkSize -- int: Number of bytes counted at once.
+
+    The JSON part begins with the first opening curly bracket
+    and ends with the matching closing curly bracket.
+    Chunks that cannot contain the matching bracket are skipped
+    by just counting their brackets.
+
+    Return a tuple (start, end) of offsets, where end is exclusive.
+    Return (0, 0) if there is no opening curly bracket.
+    Return None if the curly brackets are unbalanced.
+    """
+    start = buffer.find(b'{')
+    if start < 0:
+        return 0, 0
+
+    level = 0
+    pos = start
+    with memoryview(buffer) as view:
+        size = len(view)
+        while pos < size:
+            chunk = view[pos:pos + chunkSize].tobytes()
+            closing = chunk.count(b'}')
+            if level > closing:
+                # The level cannot drop to zero within this chunk.
+                level += chunk.count(b'{') - closing
+                pos += len(chunk)
+                continue
+
+            for match in BRACKETS.finditer(chunk):
+                if match.group() == b'{':
+                    level += 1
+                else:
+                    level -= 1
+                    if level == 0:
+                        return start, pos + match.end()
+
+            pos += len(chunk)
+    return None
+
+
+def get_json_region(buffer):
+    """Return a zero-copy memoryview of the JSON part in a binary buffer.
+    
+    Positional arguments:
+        buffer -- bytes-like object: Content of an Aeon 3 project file.
+
+    Return None if the curly brackets are unbalanced.
+    """
+    region = find_json_region(buffer)
+    if region is None:
+        return None
+
+    start, end = region
+    return memoryview(buffer)[start:end]
+
+
 def scan_file(filePath):
     """Read and scan an Aeon Timeline 3 '.aeon' project file.
     
@@ -72,72 +159,367 @@ def scan_file(filePath):
         return f'{ERROR}Cannot read "{os.path.normpath(filePath)}".'
 
     # JSON part: all characters between the first and last curly bracket.
-    chrData = []
-    opening = ord('{')
-    closing = ord('}')
-    level = 0
-    for c in binInput:
-        if c == opening:
-            level += 1
-        if level > 0:
-            chrData.append(c)
-            if c == closing:
-                level -= 1
-                if level == 0:
-                    break
-
-    if level != 0:
+    jsonRegion = get_json_region(binInput)
+    if jsonRegion is None:
         return f'{ERROR}Corrupted data.'
 
     try:
-        jsonStr = codecs.decode(bytes(chrData), encoding='utf-8')
+        jsonStr = codecs.decode(jsonRegion, encoding='utf-8')
     except:
         return f'{ERROR}Cannot decode "{os.path.normpath(filePath)}".'
 
     return jsonStr
 
 
-def run(sourcePath):
-    """Extract JSON data from an .aeonzip or .aeon file
-    and create a pretty-printed JSON file.
-    Return a message beginning with the ERROR constant in case of error.
+def map_timeline(filePath):
+    """Memory-map an Aeon Timeline 3 '.aeon' project file and decode the JSON part.
+
+    Positional arguments:
+        filePath -- str: Path to the Aeon 3 project file.
+
+    Only the JSON part is copied out of the mapped file;
+    the binary data behind it is never read.
+    If the file cannot be mapped, fall back to scan_file().
+        
+    Return a message beginning with the ERROR constant in case of error
+    and a Python object containing the timeline structure.
+    """
+    try:
+        with open(filePath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mappedFile:
+                region = find_json_region(mappedFile)
+                if region is None:
+                    return f'{ERROR}Corrupted data.', None
+
+                start, end = region
+                jsonBytes = mappedFile[start:end]
+    except(FileNotFoundError):
+        return f'{ERROR}"{os.path.normpath(filePath)}" not found.', None
+
+    except (OSError, ValueError):
+        # Empty file, or mapping not supported.
+        jsonBytes = None
+
+    if jsonBytes is None:
+        jsonPart = scan_file(filePath)
+        if jsonPart.startswith(ERROR):
+            return jsonPart, None
+
+        jsonBytes = jsonPart.encode('utf-8')
+    if not jsonBytes:
+        return f'{ERROR}No JSON part found.', None
+
+    try:
+        jsonData = json.loads(jsonBytes)
+    except ValueError:
+        return f'{ERROR}Invalid JSON data.', None
+
+    return 'Timeline data read in.', jsonData
+
+
+def read_timeline(sourcePath):
+    """Read the timeline structure of an .aeonzip or .aeon file.
+
+    Positional arguments:
+        sourcePath -- str: Path of the Aeon 2 or Aeon 3 project file.
+        
+    Return a message beginning with the ERROR constant in case of error
+    and a Python object containing the timeline structure.
     """
     if sourcePath.endswith(AEON3_EXT):
-        jsonPart = scan_file(sourcePath)
-        if not jsonPart:
-            return f'{ERROR}No JSON part found.'
+        return map_timeline(sourcePath)
 
-        elif jsonPart.startswith(ERROR):
-            return jsonPart
+    if sourcePath.endswith(AEON2_EXT):
+        return open_timeline(sourcePath)
 
-        try:
-            jsonData = json.loads(jsonPart)
-        except('JSONDecodeError'):
-            return f'{ERROR}Invalid JSON data.'
+    return f'{ERROR}File format not supported.', None
 
-    elif sourcePath.endswith(AEON2_EXT):
-        message, jsonData = open_timeline(sourcePath)
-        if message.startswith(ERROR):
-            return message
 
-    else:
-        return(f'{ERROR}File format not supported.')
+def write_json(jsonData, targetPath):
+    """Write a pretty-printed JSON file without building the whole document in memory.
 
-    targetPath = f'{sourcePath}{JSON_EXT}'
+    Positional arguments:
+        jsonData -- Python object containing the timeline structure.
+        targetPath -- str: Path of the JSON file to write.
+
+    The encoder's output fragments are collected 
+    and written in chunks of about WRITE_CHUNK_SIZE characters.
+    The result is identical to json.dumps(jsonData, indent=4, sort_keys=True, ensure_ascii=False).
+    Return a message beginning with the ERROR constant in case of error.
+    """
+    encoder = json.JSONEncoder(indent=4, sort_keys=True, ensure_ascii=False)
     try:
         with open(targetPath, 'w', encoding='utf-8') as f:
-            f.write(json.dumps(jsonData, indent=4, sort_keys=True, ensure_ascii=False))
+            fragments = []
+            size = 0
+            for fragment in encoder.iterencode(jsonData):
+                fragments.append(fragment)
+                size += len(fragment)
+                if size >= WRITE_CHUNK_SIZE:
+                    f.write(''.join(fragments))
+                    fragments.clear()
+                    size = 0
+            f.write(''.join(fragments))
     except:
         return f'{ERROR}Cannot write "{os.path.normpath(targetPath)}".'
 
     return f'"{os.path.normpath(targetPath)}" written.'
 
 
+def run(sourcePath):
+    """Extract JSON data from an .aeonzip or .aeon file
+    and create a pretty-printed JSON file.
+    Return a message beginning with the ERROR constant in case of error.
+    """
+    message, jsonData = read_timeline(sourcePath)
+    if message.startswith(ERROR):
+        return message
+
+    return write_json(jsonData, f'{sourcePath}{JSON_EXT}')
+
+
+def collect_sources(patterns):
+    """Return a sorted list of the project files matching the given patterns.
+    
+    Positional arguments:
+        patterns -- iterable of str: File paths, directory paths, or glob patterns.
+
+    Directories are searched recursively for .aeonzip and .aeon files.
+    Paths that match nothing are passed on as they are, 
+    so that they show up as errors in the batch summary. 
+    """
+    sources = set()
+    for pattern in patterns:
+        paths = glob.glob(pattern, recursive=True) or [pattern]
+        for path in paths:
+            if os.path.isdir(path):
+                for dirPath, __, fileNames in os.walk(path):
+                    for fileName in fileNames:
+                        if fileName.endswith(AEON2_EXT) or fileName.endswith(AEON3_EXT):
+                            sources.add(os.path.join(dirPath, fileName))
+            else:
+                sources.add(path)
+    return sorted(sources)
+
+
+def get_content_hash(sourcePath):
+    """Return a hash of the JSON part of an .aeonzip or .aeon file.
+    
+    Positional arguments:
+        sourcePath -- str: Path of the Aeon 2 or Aeon 3 project file.
+
+    For .aeonzip files, the CRC and size stored in the zip directory are used,
+    so nothing needs to be decompressed.
+    Return None if the file cannot be read.
+    """
+    try:
+        if sourcePath.endswith(AEON2_EXT):
+            with zipfile.ZipFile(sourcePath, 'r') as myzip:
+                info = myzip.getinfo('timeline.json')
+            return f'{info.CRC:08x}-{info.file_size}'
+
+        with open(sourcePath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mappedFile:
+                region = find_json_region(mappedFile)
+                if region is None:
+                    return None
+
+                start, end = region
+                with memoryview(mappedFile) as view:
+                    with view[start:end] as jsonPart:
+                        return hashlib.blake2b(jsonPart, digest_size=16).hexdigest()
+
+    except:
+        return None
+
+
+def load_cache(cachePath):
+    """Return the conversion cache dictionary read from cachePath.
+    
+    Return an empty cache, if the file does not exist or cannot be read.
+    """
+    try:
+        with open(cachePath, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except:
+        return {}
+
+    if not isinstance(cache, dict):
+        return {}
+
+    return cache
+
+
+def save_cache(cache, cachePath, cacheSize=CACHE_SIZE):
+    """Evict outdated entries and write the conversion cache to cachePath.
+    
+    Positional arguments:
+        cache -- dict: Cache entries by absolute source path.
+        cachePath -- str: Path of the cache file.
+        
+    Optional arguments:
+        cacheSize -- int: Maximum number of entries kept.
+
+    Entries of deleted source files are dropped first, 
+    then the least recently used ones beyond cacheSize.
+    Return a message beginning with the ERROR constant in case of error.
+    """
+    entries = [(key, entry) for key, entry in cache.items() if os.path.isfile(key)]
+    entries.sort(key=lambda item: item[1].get('used', 0), reverse=True)
+    cache.clear()
+    cache.update(entries[:cacheSize])
+    tempPath = f'{cachePath}.tmp'
+    try:
+        with open(tempPath, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tempPath, cachePath)
+    except:
+        return f'{ERROR}Cannot write "{os.path.normpath(cachePath)}".'
+
+    return f'"{os.path.normpath(cachePath)}" written.'
+
+
+def check_cache(cache, sourcePath):
+    """Check whether the JSON file of a source file is up to date.
+    
+    Positional arguments:
+        cache -- dict: Cache entries by absolute source path.
+        sourcePath -- str: Path of the Aeon 2 or Aeon 3 project file.
+
+    If size and modification time are unchanged, the file is not read at all.
+    Otherwise, the hash of the JSON part decides.
+    Return a tuple (isCurrent, entry), where entry is the new cache entry,
+    or None if the source file cannot be read.
+    """
+    try:
+        stat = os.stat(sourcePath)
+    except OSError:
+        return False, None
+
+    entry = cache.get(os.path.abspath(sourcePath))
+    if not os.path.isfile(f'{sourcePath}{JSON_EXT}'):
+        entry = None
+    if entry is not None and entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime_ns:
+        return True, entry
+
+    contentHash = get_content_hash(sourcePath)
+    if contentHash is None:
+        return False, None
+
+    newEntry = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'hash': contentHash}
+    return entry is not None and entry.get('hash') == contentHash, newEntry
+
+
+def run_batch(patterns, workers=None, cachePath=None, force=False, cacheSize=CACHE_SIZE):
+    """Create pretty-printed JSON files for many .aeonzip or .aeon files.
+    
+    Positional arguments:
+        patterns -- iterable of str: File paths, directory paths, or glob patterns.
+
+    Optional arguments:
+        workers -- int: Number of worker processes. 
+                   Default (None or 0): number of processors. 
+                   1 processes the files one after another without a pool.
+        cachePath -- str: Path of the conversion cache file. 
+                     If given, files whose JSON part is unchanged are skipped.
+        force -- bool: If True, convert all files, but update the cache.
+        cacheSize -- int: Maximum number of cache entries kept.
+
+    A failing file does not stop the batch.
+    Return a summary dictionary with the total and failed counts,
+    and a list of per-file results in the order of the sorted source paths.
+    With a cache, the summary also has the hit and miss counts.
+    """
+    sources = collect_sources(patterns)
+    messages = {}
+    cache = None
+    newEntries = {}
+    pending = sources
+    if cachePath is not None:
+        cache = load_cache(cachePath)
+        pending = []
+        for sourcePath in sources:
+            isCurrent, newEntries[sourcePath] = check_cache(cache, sourcePath)
+            if isCurrent and not force:
+                messages[sourcePath] = f'"{os.path.normpath(sourcePath + JSON_EXT)}" is up to date.'
+            else:
+                pending.append(sourcePath)
+    if workers == 1:
+        for sourcePath in pending:
+            try:
+                messages[sourcePath] = run(sourcePath)
+            except Exception as ex:
+                messages[sourcePath] = f'{ERROR}{ex}'
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers or None) as executor:
+            futures = {executor.submit(run, sourcePath): sourcePath for sourcePath in pending}
+            for future in as_completed(futures):
+                sourcePath = futures[future]
+                try:
+                    messages[sourcePath] = future.result()
+                except Exception as ex:
+                    messages[sourcePath] = f'{ERROR}{ex}'
+    results = []
+    for sourcePath in sources:
+        message = messages[sourcePath]
+        results.append({
+            'source': os.path.normpath(sourcePath),
+            'ok': not message.startswith(ERROR),
+            'message': message,
+        })
+    summary = {
+        'total': len(results),
+        'failed': sum(1 for result in results if not result['ok']),
+        'results': results,
+    }
+    if cache is not None:
+        now = time.time()
+        for sourcePath, result in zip(sources, results):
+            entry = newEntries[sourcePath]
+            if result['ok'] and entry is not None:
+                entry['used'] = now
+                cache[os.path.abspath(sourcePath)] = entry
+            else:
+                cache.pop(os.path.abspath(sourcePath), None)
+        summary['hits'] = len(sources) - len(pending)
+        summary['misses'] = len(pending)
+        message = save_cache(cache, cachePath, cacheSize)
+        if message.startswith(ERROR):
+            summary['cache'] = message
+    return summary
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
         description=f'Create a pretty-printed JSON file from an Aeon Timeline 2/3 file {VERSION}',
         epilog='')
-    parser.add_argument('sourcePath', metavar='Sourcefile',
-                        help='The path of the .aeonzip or .aeon file.')
+    parser.add_argument('sourcePaths', metavar='Sourcefile', nargs='+',
+                        help='The path of the .aeonzip or .aeon file. '
+                        'Batch mode: several paths, directories, or glob patterns.')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Batch mode: number of worker processes (default: number of processors). '
+                        '0: number of processors.')
+    parser.add_argument('-s', '--summary', metavar='Summaryfile', default=None,
+                        help='Batch mode: write the JSON summary to this file instead of printing it.')
+    parser.add_argument('-c', '--cache', metavar='Cachefile', default=None,
+                        help='Batch mode: skip files whose JSON part is unchanged since the last run.')
+    parser.add_argument('-f', '--force', action='store_true',
+                        help='Batch mode: convert all files even if the cache says they are up to date.')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE,
+                        help=f'Batch mode: maximum number of cache entries (default: {CACHE_SIZE}).')
     args = parser.parse_args()
-    print(run(args.sourcePath))
+    if args.workers is not None and args.workers < 0:
+        parser.error('the number of worker processes must not be negative.')
+
+    if (len(args.sourcePaths) == 1 and os.path.isfile(args.sourcePaths[0])
+            and args.summary is None and args.cache is None):
+        print(run(args.sourcePaths[0]))
+    else:
+        summary = run_batch(args.sourcePaths, args.workers, args.cache, args.force, args.cache_size)
+        if args.summary is None:
+            print(json.dumps(summary, indent=4, ensure_ascii=False))
+        else:
+            with open(args.summary, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=4, ensure_ascii=False)
+        if summary['failed']:
+            sys.exit(1)
@@ -0,0 +1,344 @@
+"""Calculate Panchanga dates: lunar month, tithi, and nakshatra.
+
+The solar and lunar longitudes are approximated with the main terms
+given by Jean Meeus, "Astronomical Algorithms", chapters 25 and 47.
+The sidereal longitudes refer to the Lahiri ayanamsa.
+
+The boundary instants of tithis, nakshatras, and lunar months
+are precomputed once per block of days into sorted lists,
+so that each date is looked up by binary search.
+
+Usage:
+
+    panchangaDate = get_panchanga_date(julianDay)
+    panchangaDates = get_panchanga_dates(julianDays)
+
+Copyright (c) 2026 Peter Triesberger
+https://github.com/peter88213/paeon
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from bisect import bisect_right
+from functools import lru_cache
+import math
+
+MONTH_NAMES = [
+    'Chaitra',
+    'Vaishakha',
+    'Jyeshtha',
+    'Ashadha',
+    'Shravana',
+    'Bhadrapada',
+    'Ashvin',
+    'Kartika',
+    'Margashirsha',
+    'Pausha',
+    'Magha',
+    'Phalguna',
+]
+ADHIKA = 'Adhika'
+PAKSHA_NAMES = ['Shukla', 'Krishna']
+TITHI_NAMES = [
+    'Pratipada',
+    'Dwitiya',
+    'Tritiya',
+    'Chaturthi',
+    'Panchami',
+    'Shashthi',
+    'Saptami',
+    'Ashtami',
+    'Navami',
+    'Dashami',
+    'Ekadashi',
+    'Dwadashi',
+    'Trayodashi',
+    'Chaturdashi',
+]
+PURNIMA = 'Purnima'
+AMAVASYA = 'Amavasya'
+NAKSHATRA_NAMES = [
+    'Ashwini',
+    'Bharani',
+    'Krittika',
+    'Rohini',
+    'Mrigashira',
+    'Ardra',
+    'Punarvasu',
+    'Pushya',
+    'Ashlesha',
+    'Magha',
+    'Purva Phalguni',
+    'Uttara Phalguni',
+    'Hasta',
+    'Chitra',
+    'Swati',
+    'Vishakha',
+    'Anuradha',
+    'Jyeshtha',
+    'Mula',
+    'Purva Ashadha',
+    'Uttara Ashadha',
+    'Shravana',
+    'Dhanishta',
+    'Shatabhisha',
+    'Purva Bhadrapada',
+    'Uttara Bhadrapada',
+    'Revati',
+]
+
+JD_J2000 = 2451545.0
+DAYS_PER_CENTURY = 36525
+SECONDS_PER_DAY = 86400
+JD_EPOCH = 1721425.5
+# Julian day of 0001-01-01 00:00 (proleptic Gregorian calendar)
+AYANAMSA_J2000 = 23.853
+AYANAMSA_PER_CENTURY = 1.3969
+
+TITHI_ARC = 12.0
+NAKSHATRA_ARC = 360 / 27
+RASHI_ARC = 30.0
+SAMPLE_STEP = 0.5
+# Days; neither the elongation nor the moon move more than one arc in a step.
+REFINE_STEPS = 5
+
+BLOCK_DAYS = 366
+BLOCK_MARGIN = 40
+# Days before and after a block; enough to find the surrounding new moons.
+BLOCK_CACHE_SIZE = 256
+
+
+def get_julian_day(year, month, day, hour=0, minute=0, second=0):
+    """Return the Julian day for a date in the proleptic Gregorian calendar.
+
+    Years are numbered astronomically: year 0 is 1 BC, year -1 is 2 BC, and so on.
+    This is Howard Hinnant's days_from_civil algorithm.
+    """
+    year -= month <= 2
+    era = year // 400
+    yearOfEra = year - era * 400
+    dayOfYear = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    dayOfEra = yearOfEra * 365 + yearOfEra // 4 - yearOfEra // 100 + dayOfYear
+    dayNumber = era * 146097 + dayOfEra - 306
+    # days since 0001-01-01
+    return JD_EPOCH + dayNumber + (hour * 3600 + minute * 60 + second) / SECONDS_PER_DAY
+
+
+def get_dynamical_time(julianDay):
+    """Return the Julian ephemeris day for a Julian day (UT).
+
+    The difference between dynamical time and universal time is estimated
+    with the Morrison/Stephenson parabola.
+    """
+    u = ((julianDay - JD_J2000) / 365.25 + 2000 - 1820) / 100
+    return julianDay + (-20 + 32 * u * u) / SECONDS_PER_DAY
+
+
+def get_sun_longitude(t):
+    """Return the sun's geometric tropical longitude in degrees.
+
+    Positional arguments:
+        t -- float: Julian centuries of dynamical time since J2000.0.
+    """
+    l0 = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    m = math.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    c = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * math.sin(m)
+         +(0.019993 - 0.000101 * t) * math.sin(2 * m)
+         +0.000289 * math.sin(3 * m))
+    return l0 + c
+
+
+def get_moon_longitude(t):
+    """Return the moon's tropical longitude in degrees, from the main periodic terms.
+
+    Positional arguments:
+        t -- float: Julian centuries of dynamical time since J2000.0.
+    """
+    lPrime = 218.3164477 + 481267.88123421 * t
+    d = math.radians(297.8501921 + 445267.1114034 * t)
+    m = math.radians(357.5291092 + 35999.0502909 * t)
+    mPrime = math.radians(134.9633964 + 477198.8675055 * t)
+    f = math.radians(93.2720950 + 483202.0175233 * t)
+    e = 1 - 0.002516 * t
+    return (lPrime
+            +6.288774 * math.sin(mPrime)
+            +1.274027 * math.sin(2 * d - mPrime)
+            +0.658314 * math.sin(2 * d)
+            +0.213618 * math.sin(2 * mPrime)
+            -0.185116 * e * math.sin(m)
+            -0.114332 * math.sin(2 * f)
+            +0.058793 * math.sin(2 * d - 2 * mPrime)
+            +0.057066 * e * math.sin(2 * d - m - mPrime)
+            +0.053322 * math.sin(2 * d + mPrime)
+            +0.045758 * e * math.sin(2 * d - m)
+            -0.040923 * e * math.sin(m - mPrime)
+            -0.034720 * math.sin(d)
+            -0.030383 * e * math.sin(m + mPrime)
+            +0.015327 * math.sin(2 * d - 2 * f)
+            -0.012528 * math.sin(mPrime + 2 * f)
+            +0.010980 * math.sin(mPrime - 2 * f)
+            +0.010675 * math.sin(4 * d - mPrime)
+            +0.010034 * math.sin(3 * mPrime)
+            +0.008548 * math.sin(4 * d - 2 * mPrime))
+
+
+def get_longitudes(julianDay):
+    """Return a tuple (sun, moon) of sidereal longitudes in degrees, not normalized."""
+    t = (get_dynamical_time(julianDay) - JD_J2000) / DAYS_PER_CENTURY
+    ayanamsa = AYANAMSA_J2000 + AYANAMSA_PER_CENTURY * t
+    return get_sun_longitude(t) - ayanamsa, get_moon_longitude(t) - ayanamsa
+
+
+def get_elongation(julianDay):
+    """Return the moon's elongation from the sun in degrees, not normalized."""
+    sun, moon = get_longitudes(julianDay)
+    return moon - sun
+
+
+def get_moon_sidereal(julianDay):
+    """Return the moon's sidereal longitude in degrees, not normalized."""
+    return get_longitudes(julianDay)[1]
+
+
+def get_sun_sidereal(julianDay):
+    """Return the sun's sidereal longitude in degrees, not normalized."""
+    return get_longitudes(julianDay)[0]
+
+
+def find_boundaries(angle, arc, firstJd, lastJd):
+    """Return the instants where an increasing angle crosses multiples of an arc.
+
+    Positional arguments:
+        angle -- function returning the angle in degrees for a Julian day.
+                 It must increase by less than one arc per SAMPLE_STEP.
+        arc -- float: Width of a division in degrees.
+        firstJd, lastJd -- float: Julian days of the span to search.
+
+    Return two sorted lists: the Julian days of the boundaries,
+    and the numbers of the divisions beginning there, counted from 0 at 0°.
+    """
+    times = []
+    divisions = []
+    jd = firstJd
+    value = angle(jd) % 360
+    while jd < lastJd:
+        nextJd = jd + SAMPLE_STEP
+        nextValue = angle(nextJd) % 360
+        if nextValue < value:
+            nextValue += 360
+        division = math.floor(nextValue / arc)
+        if division > math.floor(value / arc):
+            # Refine the crossing by linear interpolation (regula falsi).
+            target = division * arc
+            lower, upper = jd, nextJd
+            lowerValue, upperValue = value, nextValue
+            for __ in range(REFINE_STEPS):
+                estimate = lower + (target - lowerValue) * (upper - lower) / (upperValue - lowerValue)
+                estimateValue = angle(estimate)
+                estimateValue += 360 * round((lowerValue - estimateValue) / 360)
+                if estimateValue < target:
+                    lower, lowerValue = estimate, estimateValue
+                else:
+                    upper, upperValue = estimate, estimateValue
+            times.append(estimate)
+            divisions.append(division)
+        jd, value = nextJd, nextValue % 360
+    return times, divisions
+
+
+class PanchangaTable:
+    """Boundary instants of tithis, nakshatras, and lunar months within a span.
+
+    Public instance variables:
+        firstJd -- float: Julian day of the beginning of the span.
+        lastJd -- float: Julian day of the end of the span.
+    """
+
+    def __init__(self, firstJd, lastJd):
+        """Precompute the boundaries.
+
+        Positional arguments:
+            firstJd, lastJd -- float: Julian days of the span.
+        """
+        self.firstJd = firstJd
+        self.lastJd = lastJd
+        searchFirst = firstJd - BLOCK_MARGIN
+        searchLast = lastJd + BLOCK_MARGIN
+        self._tithiTimes, tithis = find_boundaries(get_elongation, TITHI_ARC, searchFirst, searchLast)
+        self._tithis = [tithi % 30 for tithi in tithis]
+        self._nakshatraTimes, nakshatras = find_boundaries(get_moon_sidereal, NAKSHATRA_ARC, searchFirst, searchLast)
+        self._nakshatras = [nakshatra % 27 for nakshatra in nakshatras]
+
+        # An amanta month begins with a new moon and is named after
+        # the sign the sun enters during the month.
+        # If the sun does not change its sign, the month is "Adhika".
+        newMoons = [jd for jd, tithi in zip(self._tithiTimes, self._tithis) if tithi == 0]
+        rashis = [math.floor((get_sun_sidereal(jd) % 360) / RASHI_ARC) for jd in newMoons]
+        self._monthTimes = newMoons[:-1]
+        self._months = []
+        for rashi, nextRashi in zip(rashis, rashis[1:]):
+            monthName = MONTH_NAMES[(rashi + 1) % 12]
+            if rashi == nextRashi:
+                monthName = f'{ADHIKA} {monthName}'
+            self._months.append(monthName)
+
+    def get_month(self, julianDay):
+        """Return the name of the lunar month at the given instant, or None."""
+        i = bisect_right(self._monthTimes, julianDay) - 1
+        if i < 0:
+            return None
+
+        return self._months[i]
+
+    def get_tithi(self, julianDay):
+        """Return the tithi number (0 to 29) at the given instant, or None."""
+        i = bisect_right(self._tithiTimes, julianDay) - 1
+        if i < 0:
+            return None
+
+        return self._tithis[i]
+
+    def get_nakshatra(self, julianDay):
+        """Return the nakshatra number (0 to 26) at the given instant, or None."""
+        i = bisect_right(self._nakshatraTimes, julianDay) - 1
+        if i < 0:
+            return None
+
+        return self._nakshatras[i]
+
+
+@lru_cache(maxsize=BLOCK_CACHE_SIZE)
+def get_block_table(block):
+    """Return the PanchangaTable of a block of BLOCK_DAYS days, counted from JD_EPOCH."""
+    firstJd = JD_EPOCH + block * BLOCK_DAYS
+    return PanchangaTable(firstJd, firstJd + BLOCK_DAYS)
+
+
+def get_tithi_name(tithi):
+    """Return the name of a tithi number (0 to 29), with the paksha if applicable."""
+    paksha, day = divmod(tithi, 15)
+    if day == 14:
+        if paksha:
+            return AMAVASYA
+
+        return PURNIMA
+
+    return f'{PAKSHA_NAMES[paksha]} {TITHI_NAMES[day]}'
+
+
+def get_panchanga_date(julianDay):
+    """Return the Panchanga date string for a Julian day (UT).
+
+    Example: "Chaitra, Shukla Pratipada, Revati".
+    """
+    table = get_block_table(math.floor((julianDay - JD_EPOCH) / BLOCK_DAYS))
+    month = table.get_month(julianDay)
+    tithi = table.get_tithi(julianDay)
+    nakshatra = table.get_nakshatra(julianDay)
+    return f'{month}, {get_tithi_name(tithi)}, {NAKSHATRA_NAMES[nakshatra]}'
+
+
+def get_panchanga_dates(julianDays):
+    """Return a list of Panchanga date strings for a sequence of Julian days.
+
+    None results in an empty string.
+    """
+    return ['' if jd is None else get_panchanga_date(jd) for jd in julianDays]
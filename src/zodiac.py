@@ -1,91 +1,89 @@
 #!/usr/bin/python3
 """Insert zodiac calendar eras into an Aeon Timeline 2 template.
 
-usage:
+Requires aeon_template.py, aeon_timeline.py, and zodiac_calendar.py in the same directory.
 
-zodiac.py path-to-template
+usage: zodiac.py [-h] [-s SPAN] [--cycle CYCLE] [-e ELEMENTS] [-c Cachedir] path-to-template
+
+positional arguments:
+  path-to-template      The path of the template file.
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -s SPAN, --span SPAN  Number of zodiac years. Default: 994.
+  --cycle CYCLE         Number of years per zodiac era. Default: 12.
+  -e ELEMENTS, --elements ELEMENTS
+                        Comma separated list of elements. Default: Water,Fire,Wood,Air.
+  -c Cachedir, --cache Cachedir
+                        Directory where generated era lists are cached.
 
 Copyright (c) 2024 Peter Triesberger
 https://github.com/peter88213/paeon
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
-import sys
-import xml.etree.ElementTree as ET
+
+from aeon_timeline import get_date
+from zodiac_calendar import CYCLE
+from zodiac_calendar import ELEMENTS
+from zodiac_calendar import FIRST_ERA_SHORT_NAME
+from zodiac_calendar import MODE_YEARS
+from zodiac_calendar import ZODIAC_NAMES
+from zodiac_calendar import ZODIAC_SIGNS
+from zodiac_calendar import get_argument_parser
+from zodiac_calendar import parse_arguments
+from zodiac_calendar import get_calendar
+from zodiac_calendar import get_zodiac_year
+from zodiac_calendar import write_aeon2_template
 
 NUMBER_OF_YEARS = 994
-FIRST_ERA_NAME = 'Before the Big Divide'
-FIRST_ERA_SHORT_NAME = 'Before the Big Divide'
-LAST_ERA_NAME = 'Unknown Future'
-LAST_ERA_SHORT_NAME = 'UF'
-
-ZODIAC_SIGNS = ['♈', '♉', '♊', '♋', '♌', '♍', '♎', '♏', '♐', '♑', '♒', '♓']
-ZODIAC_NAMES = [
-    'Aries',
-    'Taurus',
-    'Gemini',
-    'Cancer',
-    'Leo',
-    'Virgo',
-    'Libra',
-    'Scorpio',
-    'Sagittarius',
-    'Capricorn',
-    'Aquarius',
-    'Pisces'
-]
-ELEMENTS = ['Water', 'Fire', 'Wood', 'Air']
-
-
-def get_zodiac_year(calendarYear):
-    absoluteYear = calendarYear - 1
-    # because the calendars begins with Year One
-    absoluteEra = absoluteYear // len(ZODIAC_SIGNS)
-    element = absoluteEra % len(ELEMENTS)
-    zodiacYear = absoluteYear % len(ZODIAC_SIGNS)
-    zodiacEra = absoluteEra + 1
-    return zodiacEra, element, zodiacYear
-
-
-def main(templatePath):
-
-    def add_era(name, shortName, duration):
-        newEra = ET.SubElement(xmlEras, 'Era')
-        ET.SubElement(newEra, 'Name').text = name
-        ET.SubElement(newEra, 'ShortName').text = shortName
-        ET.SubElement(newEra, 'Index').text = str(index)
-        ET.SubElement(newEra, 'Duration').text = str(duration)
-        ET.SubElement(newEra, 'IsBackwards').text = '0'
-        ET.SubElement(newEra, 'HasLeapYears').text = '0'
-
-    xmlTree = ET.parse(templatePath)
-    xmlTemplate = xmlTree.getroot()
-    xmlRangeProperties = xmlTemplate.find('RangeProperties')
-    xmlRangeProperty = xmlRangeProperties.find('RangeProperty')
-    xmlCalendar = xmlRangeProperty.find('Calendar')
-    xmlEras = xmlCalendar.find('Eras')
-    for xmlEra in xmlEras.iterfind('Era'):
-        if xmlEra.find('Name').text == 'BC':
-            xmlEra.find('Name').text = FIRST_ERA_NAME
-            xmlEra.find('ShortName').text = FIRST_ERA_SHORT_NAME
-        else:
-            xmlEras.remove(xmlEra)
-    calendarYear = 1
-    index = 1
-    for _ in range(NUMBER_OF_YEARS):
-        zodiacEra, element, zodiacYear = get_zodiac_year(calendarYear)
-        zName = f'{ZODIAC_NAMES[zodiacYear]}, Era {zodiacEra} "Era of {ELEMENTS[element]}"'
-        zShortName = f'{ZODIAC_SIGNS[zodiacYear]}, Era {zodiacEra} "{ELEMENTS[element]}"'
-        add_era(zName, zShortName, 1)
-        index += 1
-        calendarYear += 1
-    add_era(LAST_ERA_NAME, LAST_ERA_SHORT_NAME, 9007199254740992)
+PROPERTY_ZODIAC = 'Zodiac'
+
+
+class ZodiacCalculator:
+    """Calculate the "Zodiac" event property for aeon2moon.enrich().
+    
+    The value is the zodiac year of the event's calendar year,
+    e.g. '♈ Aries, Era 1 "Water"'.
+    """
+
+    def __init__(self):
+        self.propertyName = PROPERTY_ZODIAC
+        self.guidSeed = 'propertyZodiacGuid'
+
+    def calculate(self, timestamps):
+        """Return a list of zodiac year strings, one per timestamp."""
+        values = []
+        for timestamp in timestamps:
+            if timestamp is None:
+                values.append('')
+                continue
+
+            calendarYear, __, __ = get_date(timestamp)
+            if calendarYear < 1:
+                values.append(FIRST_ERA_SHORT_NAME)
+                continue
+
+            zodiacEra, element, zodiacYear = get_zodiac_year(calendarYear)
+            values.append(
+                f'{ZODIAC_SIGNS[zodiacYear]} {ZODIAC_NAMES[zodiacYear]}, Era {zodiacEra} "{ELEMENTS[element]}"'
+            )
+        return values
+
+
+def main(templatePath, span=NUMBER_OF_YEARS, cycle=CYCLE, elements=ELEMENTS, cacheDir=None):
+    eras = get_calendar(MODE_YEARS, span, cycle, elements, cacheDir)
     filePath, _ = os.path.split(templatePath)
     newTemplate = os.path.join(filePath, 'zodiac.xml')
-    ET.indent(xmlTree)
-    xmlTree.write(newTemplate, xml_declaration=True, encoding='utf-8')
+    write_aeon2_template(templatePath, eras, newTemplate)
     print(f'New template "{newTemplate}" written')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    parser = get_argument_parser(
+        'Insert zodiac calendar eras into an Aeon Timeline 2 template.',
+        NUMBER_OF_YEARS,
+        'Number of zodiac years.'
+    )
+    args = parse_arguments(parser)
+    main(args.templatePath, args.span, args.cycle, args.elements, args.cache)
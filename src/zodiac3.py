@@ -1,91 +1,55 @@
 #!/usr/bin/python3
 """Insert zodiac calendar eras into an Aeon Timeline 3 template.
 
-usage:
+Requires aeon_template.py and zodiac_calendar.py in the same directory.
 
-zodiac3.py path-to-template
+usage: zodiac3.py [-h] [-s SPAN] [--cycle CYCLE] [-e ELEMENTS] [-c Cachedir] [--compact] path-to-template
+
+positional arguments:
+  path-to-template      The path of the template file.
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -s SPAN, --span SPAN  Number of zodiac years. Default: 994.
+  --cycle CYCLE         Number of years per zodiac era. Default: 12.
+  -e ELEMENTS, --elements ELEMENTS
+                        Comma separated list of elements. Default: Water,Fire,Wood,Air.
+  -c Cachedir, --cache Cachedir
+                        Directory where generated era lists are cached.
+  --compact             Write the template without optional whitespace and escapes.
 
 Copyright (c) 2024 Peter Triesberger
 https://github.com/peter88213/paeon
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
-import sys
-import json
-
-NUMBER_OF_YEARS = 994
-FIRST_ERA_NAME = 'Before the Big Divide'
-FIRST_ERA_SHORT_NAME = 'Before the Big Divide'
-LAST_ERA_NAME = 'Unknown Future'
-LAST_ERA_SHORT_NAME = 'UF'
 
-ZODIAC_SIGNS = ['♈', '♉', '♊', '♋', '♌', '♍', '♎', '♏', '♐', '♑', '♒', '♓']
-ZODIAC_NAMES = [
-    'Aries',
-    'Taurus',
-    'Gemini',
-    'Cancer',
-    'Leo',
-    'Virgo',
-    'Libra',
-    'Scorpio',
-    'Sagittarius',
-    'Capricorn',
-    'Aquarius',
-    'Pisces'
-]
-ELEMENTS = ['Water', 'Fire', 'Wood', 'Air']
+from zodiac_calendar import CYCLE
+from zodiac_calendar import ELEMENTS
+from zodiac_calendar import MODE_YEARS
+from zodiac_calendar import get_argument_parser
+from zodiac_calendar import parse_arguments
+from zodiac_calendar import get_calendar
+from zodiac_calendar import write_aeon3_template
 
+NUMBER_OF_YEARS = 994
 
-def get_zodiac_year(calendarYear):
-    absoluteYear = calendarYear - 1
-    # because the calendars begins with Year One
-    absoluteEra = absoluteYear // len(ZODIAC_SIGNS)
-    element = absoluteEra % len(ELEMENTS)
-    zodiacYear = absoluteYear % len(ZODIAC_SIGNS)
-    zodiacEra = absoluteEra + 1
-    return zodiacEra, element, zodiacYear
-
-
-def main(templatePath):
-
-    def get_era(name, shortName, duration):
-        return {
-            'name': name,
-            'shortName': shortName,
-            'isBackwards': False,
-            'hasLeapYears': False,
-            'leapOffset': 0,
-            'duration': str(duration)
-        }
 
-    with open(templatePath, 'r', encoding='utf-8') as f:
-        jsonTemplate = json.load(f)
-    jsonEras = [
-        {
-          'name': FIRST_ERA_NAME,
-          'shortName': FIRST_ERA_SHORT_NAME,
-          'isBackwards': True,
-          'hasLeapYears': True,
-          'leapOffset': 1,
-          'duration': 9007199254740992
-        }
-    ]
-    calendarYear = 1
-    for _ in range(NUMBER_OF_YEARS):
-        zodiacEra, element, zodiacYear = get_zodiac_year(calendarYear)
-        zName = f'{ZODIAC_NAMES[zodiacYear]}, Era {zodiacEra} "Era of {ELEMENTS[element]}"'
-        zShortName = f'{ZODIAC_SIGNS[zodiacYear]}, Era {zodiacEra} "{ELEMENTS[element]}"'
-        jsonEras.append(get_era(zName, zShortName, 1))
-        calendarYear += 1
-    jsonEras.append(get_era(LAST_ERA_NAME, LAST_ERA_SHORT_NAME, 9007199254740992))
-    jsonTemplate['definitions']['calendar']['eras'] = jsonEras
+def main(templatePath, span=NUMBER_OF_YEARS, cycle=CYCLE, elements=ELEMENTS, cacheDir=None, compact=False):
+    eras = get_calendar(MODE_YEARS, span, cycle, elements, cacheDir)
     filePath, _ = os.path.split(templatePath)
     newTemplate = os.path.join(filePath, 'zodiac.aeonTpl')
-    with open(newTemplate, 'w', encoding='utf-8') as f:
-        json.dump(jsonTemplate, f)
+    write_aeon3_template(templatePath, eras, newTemplate, compact)
     print(f'New template "{newTemplate}" written')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    parser = get_argument_parser(
+        'Insert zodiac calendar eras into an Aeon Timeline 3 template.',
+        NUMBER_OF_YEARS,
+        'Number of zodiac years.'
+    )
+    parser.add_argument('--compact', action='store_true',
+                        help='Write the template without optional whitespace and escapes.')
+    args = parse_arguments(parser)
+    main(args.templatePath, args.span, args.cycle, args.elements, args.cache, args.compact)
@@ -0,0 +1,320 @@
+"""Build "Zodiac" calendar era lists for Aeon Timeline templates.
+
+The era list depends only on a few parameters:
+the number of eras, the cycle length, and the element list.
+It is built once and can be cached on disk, keyed by the parameters.
+It is then written into an Aeon Timeline 2 XML template
+or an Aeon Timeline 3 JSON template.
+
+Usage:
+
+    eras = get_calendar(MODE_YEARS, 994, cacheDir='zodiac-cache')
+    write_aeon2_template(templatePath, eras, newTemplate)
+    write_aeon3_template(templatePath, eras, newTemplate)
+
+Copyright (c) 2026 Peter Triesberger
+https://github.com/peter88213/paeon
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+import hashlib
+import json
+import os
+
+from aeon_template import Template
+
+MODE_YEARS = 'years'
+# Each era is a zodiac year.
+MODE_ERAS = 'eras'
+# Each era is a zodiac era of cycle years.
+
+FIRST_ERA_NAME = 'Before the Big Divide'
+FIRST_ERA_SHORT_NAME = 'Before the Big Divide'
+LAST_ERA_NAME = 'Unknown Future'
+LAST_ERA_SHORT_NAME = 'UF'
+LAST_ERA_DURATION = 9007199254740992
+
+ZODIAC_SIGNS = ['♈', '♉', '♊', '♋', '♌', '♍', '♎', '♏', '♐', '♑', '♒', '♓']
+ZODIAC_NAMES = [
+    'Aries',
+    'Taurus',
+    'Gemini',
+    'Cancer',
+    'Leo',
+    'Virgo',
+    'Libra',
+    'Scorpio',
+    'Sagittarius',
+    'Capricorn',
+    'Aquarius',
+    'Pisces'
+]
+ELEMENTS = ['Water', 'Fire', 'Wood', 'Air']
+CYCLE = len(ZODIAC_SIGNS)
+CACHE_VERSION = 1
+JSON_DEFAULT_SEPARATORS = (', ', ': ')
+JSON_COMPACT_SEPARATORS = (',', ':')
+ERAS_PLACEHOLDER = '\x00eras\x00'
+
+
+def get_zodiac_year(calendarYear, cycle=CYCLE, elements=ELEMENTS):
+    """Return a tuple (zodiacEra, element, zodiacYear) for a calendar year.
+
+    Positional arguments:
+        calendarYear -- int: Year number, beginning with 1.
+
+    Optional arguments:
+        cycle -- int: Number of years per zodiac era.
+        elements -- list of element names.
+
+    zodiacEra counts from 1; element and zodiacYear are indexes.
+    """
+    absoluteYear = calendarYear - 1
+    # because the calendars begins with Year One
+    absoluteEra = absoluteYear // cycle
+    element = absoluteEra % len(elements)
+    zodiacYear = absoluteYear % cycle
+    zodiacEra = absoluteEra + 1
+    return zodiacEra, element, zodiacYear
+
+
+def get_zodiac_era(era, elements=ELEMENTS):
+    """Return a tuple (zodiacEra, element) for an era index, beginning with 0."""
+    element = era % len(elements)
+    zodiacEra = era + 1
+    return zodiacEra, element
+
+
+def build_calendar(mode, span, cycle=CYCLE, elements=ELEMENTS):
+    """Return a list of (name, shortName, duration) era tuples.
+
+    Positional arguments:
+        mode -- str: MODE_YEARS or MODE_ERAS.
+        span -- int: Number of zodiac years resp. zodiac eras.
+
+    Optional arguments:
+        cycle -- int: Number of years per zodiac era.
+        elements -- list of element names.
+
+    The list ends with an open "Unknown Future" era.
+    """
+    eras = []
+    if mode == MODE_YEARS:
+        for calendarYear in range(1, span + 1):
+            zodiacEra, element, zodiacYear = get_zodiac_year(calendarYear, cycle, elements)
+            sign = zodiacYear % len(ZODIAC_SIGNS)
+            eras.append((
+                f'{ZODIAC_NAMES[sign]}, Era {zodiacEra} "Era of {elements[element]}"',
+                f'{ZODIAC_SIGNS[sign]}, Era {zodiacEra} "{elements[element]}"',
+                1
+            ))
+    else:
+        for era in range(span):
+            zodiacEra, element = get_zodiac_era(era, elements)
+            eras.append((
+                f'Era {zodiacEra} "Era of {elements[element]}"',
+                f'Era {zodiacEra} "{elements[element]}"',
+                cycle
+            ))
+    eras.append((LAST_ERA_NAME, LAST_ERA_SHORT_NAME, LAST_ERA_DURATION))
+    return eras
+
+
+def get_cache_path(cacheDir, parameters):
+    """Return the path of the cache file for a dictionary of calendar parameters."""
+    key = hashlib.sha1(json.dumps(parameters, sort_keys=True).encode('utf-8')).hexdigest()
+    return os.path.join(cacheDir, f'zodiac-{key}.json')
+
+
+def get_calendar(mode, span, cycle=CYCLE, elements=ELEMENTS, cacheDir=None):
+    """Return a list of (name, shortName, duration) era tuples, cached on disk.
+
+    Positional arguments:
+        mode -- str: MODE_YEARS or MODE_ERAS.
+        span -- int: Number of zodiac years resp. zodiac eras.
+
+    Optional arguments:
+        cycle -- int: Number of years per zodiac era.
+        elements -- list of element names.
+        cacheDir -- str: Directory of the era list cache. Default: no cache.
+
+    See build_calendar().
+    """
+    if cacheDir is None:
+        return build_calendar(mode, span, cycle, elements)
+
+    parameters = {
+        'version': CACHE_VERSION,
+        'mode': mode,
+        'span': span,
+        'cycle': cycle,
+        'elements': list(elements),
+    }
+    cachePath = get_cache_path(cacheDir, parameters)
+    try:
+        with open(cachePath, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache['parameters'] == parameters:
+            return [tuple(era) for era in cache['eras']]
+
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    eras = build_calendar(mode, span, cycle, elements)
+    tempPath = f'{cachePath}.tmp'
+    try:
+        os.makedirs(cacheDir, exist_ok=True)
+        with open(tempPath, 'w', encoding='utf-8') as f:
+            json.dump({'parameters': parameters, 'eras': eras}, f, ensure_ascii=False)
+        os.replace(tempPath, cachePath)
+    except OSError:
+        # The cache is optional.
+        pass
+    return eras
+
+
+def get_argument_parser(description, span, spanHelp):
+    """Return a command line parser for the zodiac template scripts.
+
+    Positional arguments:
+        description -- str: Description of the script.
+        span -- int: Default number of zodiac years resp. zodiac eras.
+        spanHelp -- str: Description of the span.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('templatePath', metavar='path-to-template',
+                        help='The path of the template file.')
+    parser.add_argument('-s', '--span', type=int, default=span,
+                        help=f'{spanHelp} Default: {span}.')
+    parser.add_argument('--cycle', type=int, default=CYCLE,
+                        help=f'Number of years per zodiac era. Default: {CYCLE}.')
+    parser.add_argument('-e', '--elements', type=lambda text: [element.strip() for element in text.split(',')],
+                        default=ELEMENTS,
+                        help=f'Comma separated list of elements. Default: {",".join(ELEMENTS)}.')
+    parser.add_argument('-c', '--cache', metavar='Cachedir', default=None,
+                        help='Directory where generated era lists are cached.')
+    return parser
+
+
+def parse_arguments(parser, args=None):
+    """Parse the command line and check the numbers.
+
+    Positional arguments:
+        parser -- ArgumentParser as returned by get_argument_parser().
+
+    Optional arguments:
+        args -- list of str: Arguments to parse. Default: sys.argv.
+
+    Exit with a usage message if the span or the cycle is less than 1.
+    """
+    args = parser.parse_args(args)
+    if args.span < 1:
+        parser.error('the span must be at least 1.')
+
+    if args.cycle < 1:
+        parser.error('the cycle must be at least 1 year.')
+
+    return args
+
+
+def write_aeon2_template(templatePath, eras, newTemplate):
+    """Write an Aeon Timeline 2 XML template with the zodiac eras.
+
+    Positional arguments:
+        templatePath -- str: Path of the .xml template to read.
+        eras -- iterable of (name, shortName, duration) era tuples.
+        newTemplate -- str: Path of the .xml template to write.
+
+    The "BC" era is renamed to FIRST_ERA_NAME; the other eras are replaced.
+    """
+
+    def is_bc(xmlEra):
+        return xmlEra.findtext('Name') == 'BC'
+
+    template = Template(templatePath)
+    template.filter_eras(is_bc)
+    for xmlEra in template.get_eras():
+        xmlEra.find('Name').text = FIRST_ERA_NAME
+        xmlEra.find('ShortName').text = FIRST_ERA_SHORT_NAME
+    template.write(newTemplate, eras)
+
+
+def get_aeon3_era(name, shortName, duration):
+    """Return an Aeon Timeline 3 era dictionary."""
+    return {
+        'name': name,
+        'shortName': shortName,
+        'isBackwards': False,
+        'hasLeapYears': False,
+        'leapOffset': 0,
+        'duration': str(duration)
+    }
+
+
+def write_aeon3_template(templatePath, eras, newTemplate, compact=False):
+    """Write an Aeon Timeline 3 JSON template with the zodiac eras.
+
+    Positional arguments:
+        templatePath -- str: Path of the .aeonTpl template to read.
+        eras -- list of (name, shortName, duration) era tuples.
+        newTemplate -- str: Path of the .aeonTpl template to write.
+
+    Optional arguments:
+        compact -- bool: If True, write minimal separators and non-ASCII characters as they are.
+
+    The calendar's eras are replaced with a backwards FIRST_ERA_NAME era
+    followed by the zodiac eras.
+    The eras are not built as dictionaries, but formatted from precomputed
+    constant fragments; the output is the same as with json.dump().
+    The written template is read back and checked.
+    Raise ValueError, if the check fails.
+    """
+    if compact:
+        itemSeparator, keySeparator = JSON_COMPACT_SEPARATORS
+        ensureAscii = False
+    else:
+        itemSeparator, keySeparator = JSON_DEFAULT_SEPARATORS
+        ensureAscii = True
+    separators = (itemSeparator, keySeparator)
+    encode = json.JSONEncoder(ensure_ascii=ensureAscii).encode
+
+    with open(templatePath, 'r', encoding='utf-8') as f:
+        jsonTemplate = json.load(f)
+    firstEra = {
+        'name': FIRST_ERA_NAME,
+        'shortName': FIRST_ERA_SHORT_NAME,
+        'isBackwards': True,
+        'hasLeapYears': True,
+        'leapOffset': 1,
+        'duration': LAST_ERA_DURATION
+    }
+    jsonTemplate['definitions']['calendar']['eras'] = ERAS_PLACEHOLDER
+    head, tail = json.dumps(jsonTemplate, separators=separators, ensure_ascii=ensureAscii).split(
+        encode(ERAS_PLACEHOLDER), 1)
+
+    namePrefix = f'{itemSeparator}{{"name"{keySeparator}'
+    shortNamePrefix = f'{itemSeparator}"shortName"{keySeparator}'
+    durationPrefix = (
+        f'{itemSeparator}"isBackwards"{keySeparator}false'
+        f'{itemSeparator}"hasLeapYears"{keySeparator}false'
+        f'{itemSeparator}"leapOffset"{keySeparator}0'
+        f'{itemSeparator}"duration"{keySeparator}"'
+    )
+    with open(newTemplate, 'w', encoding='utf-8') as f:
+        f.write(head)
+        f.write('[')
+        f.write(json.dumps(firstEra, separators=separators, ensure_ascii=ensureAscii))
+        f.writelines(
+            f'{namePrefix}{encode(name)}{shortNamePrefix}{encode(shortName)}{durationPrefix}{duration}"}}'
+            for name, shortName, duration in eras
+        )
+        f.write(']')
+        f.write(tail)
+
+    #--- Check the round trip.
+    with open(newTemplate, 'r', encoding='utf-8') as f:
+        jsonEras = json.load(f)['definitions']['calendar']['eras']
+    expectedEras = [firstEra]
+    expectedEras.extend(get_aeon3_era(*era) for era in eras)
+    if jsonEras != expectedEras:
+        raise ValueError(f'Round trip check failed for "{os.path.normpath(newTemplate)}".')
@@ -1,70 +1,52 @@
 #!/usr/bin/python3
 """Insert zodiac calendar eras into an Aeon Timeline 2 template.
 
-usage:
+Requires aeon_template.py and zodiac_calendar.py in the same directory.
 
-zodiac_eras.py path-to-template
+usage: zodiac_eras.py [-h] [-s SPAN] [--cycle CYCLE] [-e ELEMENTS] [-c Cachedir] path-to-template
+
+positional arguments:
+  path-to-template      The path of the template file.
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -s SPAN, --span SPAN  Number of zodiac eras. Default: 98.
+  --cycle CYCLE         Number of years per zodiac era. Default: 12.
+  -e ELEMENTS, --elements ELEMENTS
+                        Comma separated list of elements. Default: Water,Fire,Wood,Air.
+  -c Cachedir, --cache Cachedir
+                        Directory where generated era lists are cached.
 
 Copyright (c) 2024 Peter Triesberger
 https://github.com/peter88213/paeon
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
-import sys
-import xml.etree.ElementTree as ET
-
-NUMBER_OF_ERAS = 98
-FIRST_ERA_NAME = 'Before the Big Divide'
-FIRST_ERA_SHORT_NAME = 'Before the Big Divide'
-LAST_ERA_NAME = 'Unknown Future'
-LAST_ERA_SHORT_NAME = 'UF'
-YEARS_PER_ERA = 12
-ELEMENTS = ['Water', 'Fire', 'Wood', 'Air']
 
+from zodiac_calendar import CYCLE
+from zodiac_calendar import ELEMENTS
+from zodiac_calendar import MODE_ERAS
+from zodiac_calendar import get_argument_parser
+from zodiac_calendar import parse_arguments
+from zodiac_calendar import get_calendar
+from zodiac_calendar import write_aeon2_template
 
-def get_zodiac_era(era):
-    element = era % len(ELEMENTS)
-    zodiacEra = era + 1
-    return zodiacEra, element
-
-
-def main(templatePath):
+NUMBER_OF_ERAS = 98
 
-    def add_era(name, shortName, duration):
-        newEra = ET.SubElement(xmlEras, 'Era')
-        ET.SubElement(newEra, 'Name').text = name
-        ET.SubElement(newEra, 'ShortName').text = shortName
-        ET.SubElement(newEra, 'Index').text = str(index)
-        ET.SubElement(newEra, 'Duration').text = str(duration)
-        ET.SubElement(newEra, 'IsBackwards').text = '0'
-        ET.SubElement(newEra, 'HasLeapYears').text = '0'
 
-    xmlTree = ET.parse(templatePath)
-    xmlTemplate = xmlTree.getroot()
-    xmlRangeProperties = xmlTemplate.find('RangeProperties')
-    xmlRangeProperty = xmlRangeProperties.find('RangeProperty')
-    xmlCalendar = xmlRangeProperty.find('Calendar')
-    xmlEras = xmlCalendar.find('Eras')
-    for xmlEra in xmlEras.iterfind('Era'):
-        if xmlEra.find('Name').text == 'BC':
-            xmlEra.find('Name').text = FIRST_ERA_NAME
-            xmlEra.find('ShortName').text = FIRST_ERA_SHORT_NAME
-        else:
-            xmlEras.remove(xmlEra)
-    index = 1
-    for era in range(NUMBER_OF_ERAS):
-        zodiacEra, element = get_zodiac_era(era)
-        zName = f'Era {zodiacEra} "Era of {ELEMENTS[element]}"'
-        zShortName = f'Era {zodiacEra} "{ELEMENTS[element]}"'
-        add_era(zName, zShortName, YEARS_PER_ERA)
-        index += 1
-    add_era(LAST_ERA_NAME, LAST_ERA_SHORT_NAME, 9007199254740992)
+def main(templatePath, span=NUMBER_OF_ERAS, cycle=CYCLE, elements=ELEMENTS, cacheDir=None):
+    eras = get_calendar(MODE_ERAS, span, cycle, elements, cacheDir)
     filePath, _ = os.path.split(templatePath)
     newTemplate = os.path.join(filePath, 'zodiac-eras.xml')
-    ET.indent(xmlTree)
-    xmlTree.write(newTemplate, xml_declaration=True, encoding='utf-8')
+    write_aeon2_template(templatePath, eras, newTemplate)
     print(f'New template "{newTemplate}" written')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    parser = get_argument_parser(
+        'Insert zodiac calendar eras into an Aeon Timeline 2 template.',
+        NUMBER_OF_ERAS,
+        'Number of zodiac eras.'
+    )
+    args = parse_arguments(parser)
+    main(args.templatePath, args.span, args.cycle, args.elements, args.cache)
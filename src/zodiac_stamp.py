@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+"""Aeon Timeline 2/3 Add/update the "Zodiac era" property at event start date.
+
+Requires Python 3.7+
+Requires aeon2moon.py, aeon_template.py, aeon_timeline.py, extract_json.py, and zodiac_calendar.py in the same directory.
+
+usage: zodiac_stamp.py [-h] [-l {0..9}] [--no-backup] Sourcefile
+
+positional arguments:
+  Sourcefile            The path of the .aeonzip or .aeon file.
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -l {0..9}, --level {0..9}
+                        Compression level of the timeline data. Default: zlib default.
+  --no-backup           Do not keep the previous file as a ".bak" file.
+
+The era is looked up in the timeline's own calendar, e.g. a "Zodiac" calendar
+created with zodiac.py or zodiac_eras.py.
+The era boundaries are calculated once; then each event is located by binary search.
+
+Copyright (c) 2026 Peter Triesberger
+https://github.com/peter88213/paeon
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+from bisect import bisect_right
+
+from aeon2moon import enrich
+from zodiac_calendar import ZODIAC_NAMES
+from zodiac_calendar import ZODIAC_SIGNS
+
+PROPERTY_ZODIAC_ERA = 'Zodiac era'
+SECONDS_PER_HOUR = 3600
+
+
+def count_leap_years(lastYear):
+    """Return the number of Gregorian leap years from year 1 to lastYear.
+
+    For lastYear < 1, the result is zero or negative,
+    so that differences count the leap years in between.
+    """
+    return lastYear // 4 - lastYear // 100 + lastYear // 400
+
+
+class EraTable:
+    """Calendar eras with their start timestamps, for lookup by binary search.
+
+    Aeon Timeline counts the timestamps from the beginning of the calendar's last era.
+    The forward eras before it are laid out backwards from there;
+    the backwards era covers the time before the first forward era.
+
+    Public instance variables:
+        eras -- list of the forward era dictionaries.
+        boundaries -- list of int: Start timestamp of each forward era, ascending.
+        backwardsEra -- dict: The backwards era, or None.
+        yearSeconds -- int: Length of a common year in seconds.
+    """
+
+    def __init__(self, calendar):
+        """Calculate the era boundaries.
+
+        Positional arguments:
+            calendar -- dict: Aeon 2 or Aeon 3 calendar definition.
+        """
+        secondsPerDay = calendar.get('hoursInDay', 24) * SECONDS_PER_HOUR
+        normalDays = 0
+        leapDays = 0
+        for month in calendar['months']:
+            normalDays += month['normalDuration']
+            leapDays += month['leapDuration']
+        self.yearSeconds = normalDays * secondsPerDay
+        self._leapSeconds = (leapDays - normalDays) * secondsPerDay
+
+        self.backwardsEra = None
+        self.eras = []
+        for era in calendar['eras']:
+            if not era['isBackwards']:
+                self.eras.append(era)
+            elif self.backwardsEra is None:
+                self.backwardsEra = era
+
+        self.boundaries = [0] * len(self.eras)
+        start = 0
+        for index in range(len(self.eras) - 2, -1, -1):
+            start -= self.get_era_seconds(self.eras[index])
+            self.boundaries[index] = start
+
+    def get_era_seconds(self, era):
+        """Return the length of an era in seconds.
+
+        Leap years follow the Gregorian rule, counting the years of the era
+        from one, shifted by the era's leap offset (Aeon 3 only).
+        """
+        duration = int(era['duration'])
+        seconds = duration * self.yearSeconds
+        if era['hasLeapYears'] and self._leapSeconds:
+            leapOffset = int(era.get('leapOffset', 0))
+            leapYears = count_leap_years(duration - leapOffset) - count_leap_years(-leapOffset)
+            seconds += leapYears * self._leapSeconds
+        return seconds
+
+    def get_era_index(self, timestamp):
+        """Return the index of the forward era containing the timestamp.
+
+        Return -1 if the timestamp is before the first forward era.
+        """
+        return bisect_right(self.boundaries, timestamp) - 1
+
+
+class ZodiacEraCalculator:
+    """Calculate the "Zodiac era" event property.
+
+    The value is the name of the calendar era containing the event.
+    Within multi-year eras without leap years, e.g. those created by zodiac_eras.py,
+    the year's zodiac sign is prepended, e.g. '♓ Pisces, Era 98 "Era of Fire"'.
+    The last era and the backwards era are open, so they are not divided into years.
+
+    Public instance variables:
+        propertyName -- str: Name of the event property.
+        guidSeed -- str: Text to generate the property GUID from.
+    """
+
+    def __init__(self, eraTable=None):
+        """Optional arguments:
+            eraTable -- EraTable of the timeline's calendar. 
+                        Default: set by enrich() via set_calendar().
+        """
+        self.propertyName = PROPERTY_ZODIAC_ERA
+        self.guidSeed = 'propertyZodiacEraGuid'
+        self._eraTable = eraTable
+
+    def set_calendar(self, calendar):
+        """Build the era table of the timeline's calendar definition."""
+        self._eraTable = EraTable(calendar)
+
+    def calculate(self, timestamps):
+        """Return a list of era names, one per timestamp."""
+        eraTable = self._eraTable
+        lastIndex = len(eraTable.eras) - 1
+        values = []
+        for timestamp in timestamps:
+            if timestamp is None:
+                values.append('')
+                continue
+
+            index = eraTable.get_era_index(timestamp)
+            if index < 0:
+                if eraTable.backwardsEra is None:
+                    values.append('')
+                else:
+                    values.append(eraTable.backwardsEra['name'])
+                continue
+
+            era = eraTable.eras[index]
+            if index == lastIndex or era['hasLeapYears'] or int(era['duration']) == 1:
+                values.append(era['name'])
+                continue
+
+            zodiacYear = (timestamp - eraTable.boundaries[index]) // eraTable.yearSeconds % len(ZODIAC_SIGNS)
+            values.append(f'{ZODIAC_SIGNS[zodiacYear]} {ZODIAC_NAMES[zodiacYear]}, {era["name"]}')
+        return values
+
+
+def run(filePath, compressLevel=None, backup=True):
+    """Add or update the "Zodiac era" property in an .aeonzip or .aeon file.
+
+    Positional arguments:
+        filePath -- str: Path of the .aeonzip or .aeon file.
+
+    Optional arguments:
+        compressLevel -- int: Deflate compression level 0..9 (.aeonzip only). Default: zlib's default.
+        backup -- bool: If True, keep the previous file as a ".bak" file.
+
+    Zodiac calendars have no "AD" era, so the eras are taken 
+    from the calendar of the first date range property.
+    Return a message beginning with the ERROR constant in case of error.
+    """
+    return enrich(filePath, [ZodiacEraCalculator()], compressLevel, backup, requireAd=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Aeon Timeline 2/3 Add/update the "Zodiac era" property at event start date',
+        epilog='The era is looked up in the timeline\'s own calendar.')
+    parser.add_argument('sourcePath', metavar='Sourcefile',
+                        help='The path of the .aeonzip or .aeon file.')
+    parser.add_argument('-l', '--level', type=int, choices=range(10), default=None, metavar='{0..9}',
+                        help='Compression level of the timeline data. Default: zlib default.')
+    parser.add_argument('--no-backup', action='store_true',
+                        help='Do not keep the previous file as a ".bak" file.')
+    args = parser.parse_args()
+    print(run(args.sourcePath, args.level, not args.no_backup))
@@ -0,0 +1,289 @@
+"""Unit tests for aeon2moon
+Part of the paeon project (https://github.com/peter88213/paeon)
+Copyright (c) 2026 Peter Triesberger
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from datetime import date
+from datetime import timedelta
+import json
+import io
+import os
+import stat
+import struct
+from shutil import copyfile
+import unittest
+import zipfile
+
+import aeon2moon
+from dec_time import DecimalTimeCalculator
+from zodiac import ZodiacCalculator
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+AEON2 = TEST_DATA_PATH + 'normal.aeonzip'
+TEST_AEON2 = TEST_EXEC_PATH + 'moon.aeonzip'
+TEST_BAK2 = TEST_EXEC_PATH + 'moon.aeonzip.bak'
+
+AEON3 = TEST_DATA_PATH + 'Murder on the Orient Express.aeon'
+TEST_AEON3 = TEST_EXEC_PATH + 'moon.aeon'
+TEST_BAK3 = TEST_EXEC_PATH + 'moon.aeon.bak'
+AEON3_NO_SPACE = TEST_DATA_PATH + 'normal.aeon'
+# 8 bytes of free space; the trailer's size field does not match the JSON part
+
+
+class UnseekableStream(io.RawIOBase):
+    """Write-only stream, so that zipfile writes data descriptors."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.data.extend(data)
+        return len(data)
+
+
+class PublicZipFile:
+    """ZipFile wrapper without the internals, so that zip members are recompressed."""
+
+    def __init__(self, zipFile):
+        self.open = zipFile.open
+
+
+def get_timestamp(year, month, day, hour=0):
+    return ((date(year, month, day).toordinal() - 1) * 24 + hour) * 3600
+
+
+class MoonPhases(unittest.TestCase):
+    """Batch calculation of moon phases."""
+
+    def test_conway(self):
+        startDate = date(1890, 1, 1)
+        dates = [startDate + timedelta(days=i) for i in range(0, 80000, 7)]
+        timestamps = [get_timestamp(d.year, d.month, d.day, 13) for d in dates]
+        phases = aeon2moon.get_moon_phases(timestamps)
+        for d, (phaseDay, display) in zip(dates, phases):
+            dateStr = d.isoformat()
+            self.assertEqual(phaseDay, aeon2moon.get_moon_phase(dateStr))
+            self.assertEqual(display, aeon2moon.get_moon_phase_plus(dateStr))
+
+    def test_meeus(self):
+        # New moon on 2000-01-06 18:14 UT, full moon on 2000-01-21 04:40 UT.
+        timestamps = [
+            get_timestamp(2000, 1, 6, 17),
+            get_timestamp(2000, 1, 6, 19),
+            get_timestamp(2000, 1, 21, 12),
+            None,
+        ]
+        phases = aeon2moon.get_moon_phases(timestamps, aeon2moon.ENGINE_MEEUS)
+        self.assertEqual([phaseDay for phaseDay, __ in phases], [29, 0, 14, None])
+        self.assertEqual(phases[2][1], aeon2moon.MOON_PHASE_DISPLAY[14])
+
+    def test_new_moon(self):
+        # Meeus, "Astronomical Algorithms", example 49.a: 1977-02-18 03:37:42 TD.
+        # Delta T is about one minute then.
+        self.assertAlmostEqual(aeon2moon.get_new_moon(-283), 2443192.65118, delta=0.002)
+
+    def test_missing_dates(self):
+        self.assertEqual(aeon2moon.get_moon_phases([None]), [(None, '')])
+
+    def test_bc_dates(self):
+        phaseDay, display = aeon2moon.get_moon_phases([-86400 * 1000])[0]
+        self.assertIn(phaseDay, range(30))
+        self.assertEqual(display, aeon2moon.MOON_PHASE_DISPLAY[phaseDay])
+
+
+class Guids(unittest.TestCase):
+    """GUID generation."""
+
+    def test_get_uid(self):
+        self.assertEqual(aeon2moon.get_uid('propertyMoonphaseGuid'), '4E379E27-3156-BD35-A9C2-4ABD273FED4F')
+        texts = ['', 'Moon phase', 'ä' * 100]
+        guids = [
+            '90D79161-3170-4EFB-ADED-3521D428F6DE',
+            '6B5D4554-B41C-398F-ECD9-D5604CE1EA6F',
+            '671587DD-69D8-DD7F-5679-7C9ECB8F132A',
+        ]
+        self.assertEqual(aeon2moon.get_uids(texts), guids)
+
+
+class NormalOperation(unittest.TestCase):
+    """Operation under normal condition, i.e.:
+    * Test data is present and readable 
+    * test data integrity is o.k.
+    """
+
+    def tearDown(self):
+
+        try:
+            os.remove(TEST_AEON2)
+        except:
+            pass
+
+        try:
+            os.remove(TEST_BAK2)
+        except:
+            pass
+
+        try:
+            os.remove(TEST_AEON3)
+        except:
+            pass
+
+        try:
+            os.remove(TEST_BAK3)
+        except:
+            pass
+
+    def test_aeon2(self):
+        copyfile(AEON2, TEST_AEON2)
+        with zipfile.ZipFile(TEST_AEON2, 'a') as myzip:
+            myzip.writestr('attachment.txt', 'Attachment ' * 100, compress_type=zipfile.ZIP_DEFLATED)
+        self.assertTrue(aeon2moon.run(TEST_AEON2, compressLevel=1).startswith(f'"{os.path.normpath(TEST_AEON2)}" written.'))
+        with zipfile.ZipFile(TEST_AEON2, 'r') as myzip:
+            self.assertIsNone(myzip.testzip())
+            self.assertEqual(myzip.read('attachment.txt'), b'Attachment ' * 100)
+            jsonData = json.loads(myzip.read('timeline.json'))
+        with zipfile.ZipFile(TEST_BAK2, 'r') as myzip:
+            self.assertNotIn(b'Moon phase', myzip.read('timeline.json'))
+        properties = [tplPrp['name'] for tplPrp in jsonData['template']['properties']]
+        self.assertIn(aeon2moon.PROPERTY_MOONPHASE, properties)
+
+    def test_aeon2_zip_members(self):
+        with zipfile.ZipFile(AEON2, 'r') as myzip:
+            jsonBytes = myzip.read('timeline.json')
+        stream = UnseekableStream()
+        with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as myzip:
+            myzip.writestr('timeline.json', jsonBytes)
+            myzip.writestr('descriptor.txt', b'Descriptor ' * 100)
+            with myzip.open('zip64.txt', 'w', force_zip64=True) as f:
+                f.write(b'Zip64 ' * 100)
+        with open(TEST_AEON2, 'wb') as f:
+            f.write(stream.data)
+        with zipfile.ZipFile(TEST_AEON2, 'r') as myzip:
+            self.assertTrue(myzip.getinfo('descriptor.txt').flag_bits & aeon2moon.ZIP_DATA_DESCRIPTOR)
+            info = myzip.getinfo('zip64.txt')
+            myzip.fp.seek(info.header_offset + 28)
+            extraLength, = struct.unpack('<H', myzip.fp.read(2))
+            self.assertTrue(extraLength)
+        self.assertTrue(aeon2moon.run(TEST_AEON2).startswith(f'"{os.path.normpath(TEST_AEON2)}" written.'))
+        with zipfile.ZipFile(TEST_AEON2, 'r') as myzip:
+            self.assertIsNone(myzip.testzip())
+            self.assertEqual(myzip.read('descriptor.txt'), b'Descriptor ' * 100)
+            self.assertEqual(myzip.read('zip64.txt'), b'Zip64 ' * 100)
+            self.assertIn(b'Moon phase', myzip.read('timeline.json'))
+
+    def test_aeon2_zip_members_public_api(self):
+        with zipfile.ZipFile(AEON2, 'r') as sourceZip:
+            stream = io.BytesIO()
+            with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as targetZip:
+                for info in sourceZip.infolist():
+                    aeon2moon.copy_zip_member(PublicZipFile(sourceZip), PublicZipFile(targetZip), info)
+            with zipfile.ZipFile(stream, 'r') as targetZip:
+                self.assertIsNone(targetZip.testzip())
+                self.assertEqual(targetZip.namelist(), sourceZip.namelist())
+                for name in sourceZip.namelist():
+                    self.assertEqual(targetZip.read(name), sourceZip.read(name))
+
+    def test_aeon2_invalid_json(self):
+        with zipfile.ZipFile(TEST_AEON2, 'w') as myzip:
+            myzip.writestr('timeline.json', '{"invalid": ')
+        self.assertEqual(aeon2moon.run(TEST_AEON2), f'{aeon2moon.ERROR}Invalid JSON data in timeline.')
+
+    def test_aeon2_file_mode(self):
+        copyfile(AEON2, TEST_AEON2)
+        os.chmod(TEST_AEON2, 0o644)
+        aeon2moon.run(TEST_AEON2)
+        self.assertEqual(stat.S_IMODE(os.stat(TEST_AEON2).st_mode), 0o644)
+
+    def test_aeon3(self):
+        copyfile(AEON3, TEST_AEON3)
+        self.assertTrue(aeon2moon.run(TEST_AEON3).startswith(f'"{os.path.normpath(TEST_AEON3)}" written.'))
+        self.assertEqual(os.path.getsize(TEST_AEON3), os.path.getsize(AEON3))
+        message, jsonData, (start, end, trailer) = aeon2moon.open_aeon3(TEST_AEON3)
+        self.assertEqual(message, 'Timeline data read in.')
+        with open(TEST_AEON3, 'rb') as f:
+            data = f.read()
+        with open(AEON3, 'rb') as f:
+            original = f.read()
+        self.assertEqual(data[:start], original[:start])
+        self.assertEqual(data[trailer + 28:], original[trailer + 28:])
+        self.assertEqual(struct.unpack_from('<Q', data, trailer + 20)[0], end - start)
+        labels = [prp['label'] for prp in jsonData['definitions']['properties']['byId'].values()]
+        self.assertIn(aeon2moon.PROPERTY_MOONPHASE, labels)
+
+    def test_aeon3_round_trip(self):
+        copyfile(AEON3, TEST_AEON3)
+        os.chmod(TEST_AEON3, 0o644)
+        message, jsonData, layout = aeon2moon.open_aeon3(TEST_AEON3)
+        self.assertEqual(aeon2moon.save_aeon3(jsonData, TEST_AEON3, layout), f'"{os.path.normpath(TEST_AEON3)}" written.')
+        with open(TEST_AEON3, 'rb') as f:
+            data = f.read()
+        with open(TEST_BAK3, 'rb') as f:
+            self.assertEqual(data, f.read())
+        self.assertEqual(stat.S_IMODE(os.stat(TEST_AEON3).st_mode), 0o644)
+
+    def test_aeon3_no_space(self):
+        copyfile(AEON3_NO_SPACE, TEST_AEON3)
+        message = aeon2moon.run(TEST_AEON3)
+        self.assertTrue(message.startswith(
+            f'{aeon2moon.ERROR}Cannot update "{os.path.normpath(TEST_AEON3)}": '
+            'Writing .aeon files is limited to files with spare padding behind the timeline data. '))
+        self.assertTrue(message.endswith(' bytes needed, 288845 bytes available.'))
+        with open(TEST_AEON3, 'rb') as f:
+            data = f.read()
+        with open(AEON3_NO_SPACE, 'rb') as f:
+            self.assertEqual(data, f.read())
+        self.assertFalse(os.path.isfile(TEST_BAK3))
+
+    def test_aeon3_size_not_found(self):
+        copyfile(AEON3_NO_SPACE, TEST_AEON3)
+        message, jsonData, layout = aeon2moon.open_aeon3(TEST_AEON3)
+        jsonData['definitions']['calendar']['dateFormat'] = 'M'
+        self.assertEqual(
+            aeon2moon.save_aeon3(jsonData, TEST_AEON3, layout),
+            f'{aeon2moon.ERROR}Unknown file structure: Size of the timeline data not found in "{os.path.normpath(TEST_AEON3)}".'
+        )
+        with open(TEST_AEON3, 'rb') as f:
+            data = f.read()
+        with open(AEON3_NO_SPACE, 'rb') as f:
+            self.assertEqual(data, f.read())
+
+    def test_unchanged(self):
+        copyfile(AEON2, TEST_AEON2)
+        aeon2moon.run(TEST_AEON2, backup=False)
+        os.utime(TEST_AEON2, ns=(0, 0))
+        self.assertEqual(aeon2moon.run(TEST_AEON2),
+                         f'"{os.path.normpath(TEST_AEON2)}" is up to date. Moon phase changed in 0 events.')
+        self.assertEqual(os.stat(TEST_AEON2).st_mtime_ns, 0)
+        self.assertFalse(os.path.isfile(TEST_BAK2))
+
+    def test_enrich(self):
+        copyfile(AEON2, TEST_AEON2)
+        calculators = [aeon2moon.MoonPhaseCalculator(), DecimalTimeCalculator(), ZodiacCalculator()]
+        message = aeon2moon.enrich(TEST_AEON2, calculators, backup=False)
+        self.assertTrue(message.startswith(f'"{os.path.normpath(TEST_AEON2)}" written.'))
+        self.assertTrue(message.endswith('Moon phase, Decimal Time, Zodiac changed in 94 events.'), message)
+        with zipfile.ZipFile(TEST_AEON2, 'r') as myzip:
+            jsonData = json.loads(myzip.read('timeline.json'))
+        properties = [tplPrp['name'] for tplPrp in jsonData['template']['properties']]
+        for calculator in calculators:
+            self.assertIn(calculator.propertyName, properties)
+        self.assertEqual(aeon2moon.enrich(TEST_AEON2, calculators),
+                         f'"{os.path.normpath(TEST_AEON2)}" is up to date. Moon phase, Decimal Time, Zodiac changed in 0 events.')
+
+    def test_decimal_time(self):
+        timestamps = [get_timestamp(2000, 1, 1, 12), -86400 * 1000 + 6 * 3600, None]
+        self.assertEqual(DecimalTimeCalculator().calculate(timestamps), ['05:00:00', '02:05:00', ''])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
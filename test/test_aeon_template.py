@@ -0,0 +1,99 @@
+"""Unit tests for aeon_template
+Part of the paeon project (https://github.com/peter88213/paeon)
+Copyright (c) 2026 Peter Triesberger
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import unittest
+import xml.etree.ElementTree as ET
+
+from aeon_template import Template
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/zodiac/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+TEMPLATE = TEST_DATA_PATH + 'fiction.xml'
+TEST_TEMPLATE = TEST_EXEC_PATH + 'template.xml'
+
+
+def get_eras(template):
+    return [(xmlEra.findtext('Name'), xmlEra.findtext('Index')) for xmlEra in template.get_eras()]
+
+
+class EraEditing(unittest.TestCase):
+    """Bulk editing of calendar eras."""
+
+    def setUp(self):
+        self.template = Template(TEMPLATE)
+
+    def tearDown(self):
+
+        try:
+            os.remove(TEST_TEMPLATE)
+        except:
+            pass
+
+    def test_calendars(self):
+        guid = '654F7379-864F-457C-8D66-E8C44BEB3779'
+        self.assertEqual(self.template.dateGuid, guid)
+        self.assertEqual(self.template.get_calendar_guid('Date'), guid)
+        self.assertEqual(self.template.calendars[guid].findtext('Name'), 'BC-AD Calendar')
+        self.assertEqual(get_eras(self.template), [('BC', '0'), ('AD', '1')])
+
+    def test_insert_and_filter(self):
+        self.template.insert_eras(1, [('X', 'X', 10), ('Y', 'Y', 10)])
+        self.assertEqual(get_eras(self.template), [('BC', '0'), ('X', '1'), ('Y', '2'), ('AD', '3')])
+        self.template.filter_eras(lambda xmlEra: xmlEra.findtext('Name') != 'X')
+        self.assertEqual(get_eras(self.template), [('BC', '0'), ('Y', '1'), ('AD', '2')])
+        self.template.filter_eras(lambda xmlEra: xmlEra.findtext('Name') == 'BC')
+        self.assertEqual(get_eras(self.template), [('BC', '0')])
+
+    def test_other_children(self):
+        xmlEras = self.template.calendars[self.template.dateGuid].find('Eras')
+        xmlEras.insert(1, ET.Element('Comment'))
+        xmlEras.append(ET.Element('Comment'))
+        self.template.insert_eras(2, [('X', 'X', 10)])
+        self.template.insert_eras(1, [('Y', 'Y', 10)])
+        self.assertEqual([child.tag for child in xmlEras], ['Era', 'Comment', 'Era', 'Era', 'Era', 'Comment'])
+        self.assertEqual(get_eras(self.template), [('BC', '0'), ('Y', '1'), ('AD', '2'), ('X', '3')])
+        self.template.filter_eras(lambda xmlEra: xmlEra.findtext('Name') != 'Y')
+        self.assertEqual([child.tag for child in xmlEras], ['Era', 'Comment', 'Era', 'Era', 'Comment'])
+
+    def test_replace_other_children(self):
+        xmlEras = self.template.calendars[self.template.dateGuid].find('Eras')
+        xmlEras.insert(0, ET.Element('Comment'))
+        xmlEras.append(ET.Element('Comment'))
+        self.template.replace_eras([('A', 'A', 1), ('B', 'B', 2), ('C', 'C', 3)])
+        self.assertEqual([child.tag for child in xmlEras], ['Comment', 'Era', 'Era', 'Era', 'Comment'])
+        self.assertEqual(get_eras(self.template), [('A', '0'), ('B', '1'), ('C', '2')])
+
+    def test_no_eras_element(self):
+        xmlCalendar = self.template.calendars[self.template.dateGuid]
+        xmlCalendar.remove(xmlCalendar.find('Eras'))
+        self.assertEqual(self.template.get_eras(), [])
+        self.template.filter_eras(lambda xmlEra: True)
+        self.template.replace_eras([])
+        self.template.insert_eras(0, [])
+        self.template.write(TEST_TEMPLATE)
+        self.assertIsNone(xmlCalendar.find('Eras'))
+        template = Template(TEST_TEMPLATE)
+        self.assertIsNone(template.calendars[template.dateGuid].find('Eras'))
+        template.write(TEST_TEMPLATE, iter((('A', 'A', 1),)))
+        self.assertEqual(get_eras(Template(TEST_TEMPLATE)), [('A', '0')])
+
+    def test_replace_and_write(self):
+        self.template.replace_eras([('A', 'A', 1), ('B', 'B', 2)])
+        self.template.write(TEST_TEMPLATE, (('C', 'C', 3),))
+        template = Template(TEST_TEMPLATE)
+        self.assertEqual(get_eras(template), [('A', '0'), ('B', '1'), ('C', '2')])
+        self.assertEqual(template.get_eras()[2].findtext('Duration'), '3')
+        self.assertEqual(len(template.get_eras()[2]), 6)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
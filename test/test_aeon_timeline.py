@@ -0,0 +1,32 @@
+"""Unit tests for aeon_timeline
+Part of the paeon project (https://github.com/peter88213/paeon)
+Copyright (c) 2026 Peter Triesberger
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from datetime import date
+import unittest
+
+import aeon_timeline
+
+
+class DateConversion(unittest.TestCase):
+    """Conversion of Aeon timestamps to calendar dates."""
+
+    def test_ad(self):
+        for dayNumber in range(0, date.max.toordinal(), 997):
+            d = date.fromordinal(dayNumber + 1)
+            self.assertEqual(aeon_timeline.get_day_date(dayNumber), (d.year, d.month, d.day))
+        self.assertEqual(aeon_timeline.get_date(60971198400), (1933, 2, 7))
+
+    def test_bc(self):
+        self.assertEqual(aeon_timeline.get_date(-1), (0, 12, 31))
+        self.assertEqual(aeon_timeline.get_day_date(-366), (0, 1, 1))
+        self.assertEqual(aeon_timeline.get_day_date(-367), (-1, 12, 31))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
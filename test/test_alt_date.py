@@ -0,0 +1,111 @@
+"""Unit tests for alt_date
+Part of the paeon project (https://github.com/peter88213/paeon)
+Copyright (c) 2026 Peter Triesberger
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import csv
+import os
+from shutil import copyfile
+import unittest
+
+import aeon2moon
+import alt_date
+import panchanga
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+CSV = TEST_DATA_PATH + 'Murder on the Orient Express.csv'
+TEST_CSV = TEST_EXEC_PATH + 'alt_date.csv'
+AEON3 = TEST_DATA_PATH + 'Murder on the Orient Express.aeon'
+TEST_AEON3 = TEST_EXEC_PATH + 'alt_date.aeon'
+TEST_BAK3 = TEST_EXEC_PATH + 'alt_date.aeon.bak'
+
+
+class Panchanga(unittest.TestCase):
+    """Panchanga calendar calculation."""
+
+    def test_festivals(self):
+        # Ugadi 2024: the first day of Chaitra.
+        self.assertEqual(alt_date.calculate_alternate_date('2024-04-09 12:00:00'), 'Chaitra, Shukla Pratipada, Ashwini')
+        # Diwali 2023: the new moon ending Ashvin (amanta).
+        self.assertEqual(alt_date.calculate_alternate_date('2023-11-12 12:00:00'), 'Ashvin, Amavasya, Swati')
+        # 2023 had an intercalary Shravana month.
+        self.assertTrue(alt_date.calculate_alternate_date('2023-07-20 12:00:00').startswith('Adhika Shravana, '))
+        self.assertTrue(alt_date.calculate_alternate_date('2023-08-20 12:00:00').startswith('Shravana, '))
+
+    def test_invalid_dates(self):
+        self.assertEqual(alt_date.calculate_alternate_date(''), '')
+        self.assertEqual(alt_date.calculate_alternate_date('BC 0000-01-01'), '')
+
+    def test_bc_dates(self):
+        self.assertEqual(
+            alt_date.calculate_alternate_date('BC 0044-03-15 12:00:00'),
+            alt_date.calculate_alternate_date('-043-03-15 12:00:00')
+        )
+
+    def test_new_moons(self):
+        # New moon on 2000-01-06 18:14 UT, full moon on 2000-01-21 04:40 UT.
+        table = panchanga.PanchangaTable(panchanga.get_julian_day(2000, 1, 1), panchanga.get_julian_day(2000, 2, 1))
+        self.assertEqual(table.get_tithi(panchanga.get_julian_day(2000, 1, 6, 18, 5)), 29)
+        self.assertEqual(table.get_tithi(panchanga.get_julian_day(2000, 1, 6, 18, 25)), 0)
+        self.assertEqual(table.get_tithi(panchanga.get_julian_day(2000, 1, 21, 4, 30)), 14)
+        self.assertEqual(table.get_tithi(panchanga.get_julian_day(2000, 1, 21, 4, 50)), 15)
+
+    def test_calculator(self):
+        timestamps = [((738000 * 24) + 6) * 3600, None]
+        jd = panchanga.JD_EPOCH + 738000.25
+        self.assertEqual(alt_date.AlternateDateCalculator().calculate(timestamps), [panchanga.get_panchanga_date(jd), ''])
+
+
+class NormalOperation(unittest.TestCase):
+    """Operation under normal condition, i.e.:
+    * Test data is present and readable 
+    * test data integrity is o.k.
+    """
+
+    def tearDown(self):
+
+        try:
+            os.remove(TEST_CSV)
+        except:
+            pass
+
+        try:
+            os.remove(TEST_AEON3)
+        except:
+            pass
+
+        try:
+            os.remove(TEST_BAK3)
+        except:
+            pass
+
+    def test_csv(self):
+        copyfile(CSV, TEST_CSV)
+        alt_date.main(TEST_CSV)
+        with open(TEST_CSV, 'r', encoding='utf-8', newline='') as csvfile:
+            rows = list(csv.DictReader(csvfile))
+        self.assertEqual(rows[0]['Start Date'], '1933-02-07 01:17:00')
+        self.assertEqual(rows[0][alt_date.ALTERNATE_DATE_TIME_LABEL], alt_date.calculate_alternate_date('1933-02-07 01:17:00'))
+        self.assertTrue(rows[0][alt_date.ALTERNATE_DATE_TIME_LABEL].startswith('Magha, '))
+
+    def test_aeon3(self):
+        copyfile(AEON3, TEST_AEON3)
+        alt_date.main(TEST_AEON3)
+        message, jsonData, layout = aeon2moon.open_aeon3(TEST_AEON3)
+        properties = jsonData['definitions']['properties']['byId']
+        labels = [prp['label'] for prp in properties.values()]
+        self.assertIn(alt_date.ALTERNATE_DATE_TIME_LABEL, labels)
+        propertyId = aeon2moon.get_uid('propertyPanchangaDateGuid')
+        values = [item['propertyValues'].get(propertyId) for item in jsonData['data']['items']['byId'].values()]
+        self.assertIn('Magha, Shukla Dwadashi, Ardra', values)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
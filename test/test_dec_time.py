@@ -0,0 +1,145 @@
+"""Unit tests for dec_time
+Part of the paeon project (https://github.com/peter88213/paeon)
+Copyright (c) 2026 Peter Triesberger
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import csv
+import json
+import os
+from shutil import copyfile
+import stat
+import unittest
+from unittest import mock
+import zipfile
+
+from aeon_csv import parse_start_date
+from aeon_csv import process_csv
+import dec_time
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+CSV = TEST_DATA_PATH + 'Murder on the Orient Express.csv'
+TEST_CSV = TEST_EXEC_PATH + 'dec_time.csv'
+TEST_CSV_PARALLEL = TEST_EXEC_PATH + 'dec_time_parallel.csv'
+AEON2 = TEST_DATA_PATH + 'normal.aeonzip'
+TEST_AEON2 = TEST_EXEC_PATH + 'dec_time.aeonzip'
+TEST_BAK2 = TEST_EXEC_PATH + 'dec_time.aeonzip.bak'
+
+
+def read_rows(csvfile_path):
+    with open(csvfile_path, 'r', encoding='utf-8', newline='') as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+class NormalOperation(unittest.TestCase):
+    """Operation under normal condition, i.e.:
+    * Test data is present and readable 
+    * test data integrity is o.k.
+    """
+
+    def tearDown(self):
+
+        try:
+            os.remove(TEST_CSV)
+        except:
+            pass
+
+        try:
+            os.remove(TEST_CSV_PARALLEL)
+        except:
+            pass
+
+        try:
+            os.remove(TEST_AEON2)
+        except:
+            pass
+
+        try:
+            os.remove(TEST_BAK2)
+        except:
+            pass
+
+    def test_csv(self):
+        copyfile(CSV, TEST_CSV)
+        dec_time.main(TEST_CSV)
+        rows = read_rows(TEST_CSV)
+        self.assertEqual(len(rows), len(read_rows(CSV)))
+        self.assertEqual(rows[0]['Start Date'], '1933-02-07 01:17:00')
+        self.assertEqual(rows[0][dec_time.ALTERNATE_DATE_TIME_LABEL], '00:05:34')
+        with open(TEST_CSV, 'r', encoding='utf-8') as f:
+            self.assertTrue(f.readline().startswith('"Type","Display ID",'))
+        self.assertEqual([f for f in os.listdir(TEST_EXEC_PATH) if f.endswith('.tmp')], [])
+
+    def test_file_mode(self):
+        copyfile(CSV, TEST_CSV)
+        os.chmod(TEST_CSV, 0o644)
+        dec_time.main(TEST_CSV)
+        self.assertEqual(stat.S_IMODE(os.stat(TEST_CSV).st_mode), 0o644)
+
+    def test_aeon2(self):
+        copyfile(AEON2, TEST_AEON2)
+        dec_time.main(TEST_AEON2)
+        with zipfile.ZipFile(TEST_AEON2, 'r') as myzip:
+            jsonData = json.loads(myzip.read('timeline.json'))
+        properties = [tplPrp['name'] for tplPrp in jsonData['template']['properties']]
+        self.assertIn(dec_time.ALTERNATE_DATE_TIME_LABEL, properties)
+        self.assertTrue(os.path.isfile(TEST_BAK2))
+
+    def test_parallel(self):
+        copyfile(CSV, TEST_CSV)
+        copyfile(CSV, TEST_CSV_PARALLEL)
+        dec_time.main(TEST_CSV)
+        process_csv(TEST_CSV_PARALLEL, dec_time.ALTERNATE_DATE_TIME_LABEL, dec_time.transform_row, workers=2, chunk_size=7)
+        with open(TEST_CSV, 'rb') as f:
+            serial = f.read()
+        with open(TEST_CSV_PARALLEL, 'rb') as f:
+            self.assertEqual(f.read(), serial)
+
+    def test_bc_date(self):
+        self.assertEqual(dec_time.calculate_alternate_date('BC 0044-03-15 12:00:00'), '05:00:00')
+        self.assertEqual(dec_time.calculate_alternate_date('BC 0000-03-15 12:00:00'), '')
+        self.assertEqual(dec_time.calculate_alternate_date('2000-01-01'), '')
+
+    def test_decimal_times(self):
+        seconds = list(range(86400)) + [-1]
+        expected = [dec_time.get_decimal_time(value) for value in range(86400)] + ['']
+        self.assertEqual(dec_time.get_decimal_times(seconds), expected)
+        self.assertEqual(
+            dec_time.calculate_alternate_dates(['1933-02-07 01:17:00', 'BC 0044-03-15 12:00:00', '', '2000-01-01']),
+            ['00:05:34', '05:00:00', '', '']
+        )
+
+    def test_decimal_times_fallback(self):
+        seconds = [86399, -1, 0, 4620, 43200, 4620, -1, 864, 863]
+        expected = ['09:09:99', '', '00:00:00', '00:05:34', '05:00:00', '00:05:34', '', '00:01:00', '00:00:99']
+        with mock.patch.object(dec_time, 'np', None):
+            self.assertEqual(dec_time.get_decimal_times(seconds), expected)
+
+    @unittest.skipIf(dec_time.np is None, 'NumPy is not installed.')
+    def test_decimal_times_numpy(self):
+        seconds = list(range(86399, -1, -1)) + [-1, 4620, -1, 4620]
+        with mock.patch.object(dec_time, 'np', None):
+            expected = dec_time.get_decimal_times(seconds)
+        self.assertEqual(dec_time.get_decimal_times(seconds), expected)
+
+    def test_parse_start_date(self):
+        self.assertEqual(parse_start_date('1933-02-07 01:17:00'), (1933, 2, 7, 1, 17, 0))
+        self.assertEqual(parse_start_date('BC 0044-03-15 12:00:00'), (-43, 3, 15, 12, 0, 0))
+        self.assertEqual(parse_start_date('BC 0001-01-01'), (0, 1, 1, None, None, None))
+        self.assertIsNone(parse_start_date(''))
+        self.assertIsNone(parse_start_date('1933-13-07 01:17:00'))
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            dec_time.main(TEST_CSV)
+        self.assertEqual([f for f in os.listdir(TEST_EXEC_PATH) if f.endswith('.tmp')], [])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,9 @@ Copyright (c) 2021 Peter Triesberger
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
+import json
 import unittest
+import zipfile
 import extract_json
 from shutil import copyfile
 
@@ -22,6 +24,8 @@ REF_JSON3 = TEST_DATA_PATH + 'extract_json/normal.aeon.json'
 TEST_AEON3 = TEST_EXEC_PATH + 'project.aeon'
 TEST_JSON3 = TEST_EXEC_PATH + 'project.aeon.json'
 
+TEST_CACHE = TEST_EXEC_PATH + 'cache.json'
+
 
 def read_file(inputFile):
 
@@ -61,6 +65,11 @@ class NormalOperation(unittest.TestCase):
         except:
             pass
 
+        try:
+            os.remove(TEST_CACHE)
+        except:
+            pass
+
     def test_aeon2(self):
         copyfile(AEON2, TEST_AEON2)
         self.assertEqual(extract_json.run(TEST_AEON2), '"' + os.path.normpath(TEST_JSON2) + '" written.')
@@ -71,6 +80,86 @@ class NormalOperation(unittest.TestCase):
         self.assertEqual(extract_json.run(TEST_AEON3), '"' + os.path.normpath(TEST_JSON3) + '" written.')
         self.assertEqual(read_file(TEST_JSON3), read_file(REF_JSON3))
 
+    def test_batch(self):
+        copyfile(AEON2, TEST_AEON2)
+        copyfile(AEON3, TEST_AEON3)
+        missing = TEST_EXEC_PATH + 'missing.aeon'
+        summary = extract_json.run_batch([TEST_AEON2, TEST_AEON3, missing], workers=1)
+        self.assertEqual(summary['total'], 3)
+        self.assertEqual(summary['failed'], 1)
+        self.assertEqual(summary['results'][0]['source'], os.path.normpath(missing))
+        self.assertFalse(summary['results'][0]['ok'])
+        self.assertEqual(read_file(TEST_JSON2), read_file(REF_JSON2))
+        self.assertEqual(read_file(TEST_JSON3), read_file(REF_JSON3))
+
+    def test_batch_all_processors(self):
+        copyfile(AEON2, TEST_AEON2)
+        summary = extract_json.run_batch([TEST_AEON2], workers=0)
+        self.assertEqual(summary['failed'], 0)
+        self.assertEqual(read_file(TEST_JSON2), read_file(REF_JSON2))
+
+    def test_batch_invalid_json(self):
+        with zipfile.ZipFile(TEST_AEON2, 'w') as myzip:
+            myzip.writestr('timeline.json', '{"invalid": ')
+        for workers in (1, 2):
+            summary = extract_json.run_batch([TEST_AEON2], workers=workers, cachePath=TEST_CACHE)
+            self.assertEqual(summary['failed'], 1)
+            self.assertEqual(summary['results'][0]['message'], f'{extract_json.ERROR}Invalid JSON data in timeline.')
+            self.assertTrue(os.path.isfile(TEST_CACHE))
+            os.remove(TEST_CACHE)
+
+    def test_cache(self):
+        copyfile(AEON2, TEST_AEON2)
+        copyfile(AEON3, TEST_AEON3)
+        sources = [TEST_AEON2, TEST_AEON3]
+        summary = extract_json.run_batch(sources, workers=1, cachePath=TEST_CACHE)
+        self.assertEqual((summary['hits'], summary['misses']), (0, 2))
+        summary = extract_json.run_batch(sources, workers=1, cachePath=TEST_CACHE)
+        self.assertEqual((summary['hits'], summary['misses']), (2, 0))
+
+        # Same JSON part, different modification time.
+        os.utime(TEST_AEON3, ns=(0, 0))
+        summary = extract_json.run_batch(sources, workers=1, cachePath=TEST_CACHE)
+        self.assertEqual((summary['hits'], summary['misses']), (2, 0))
+
+        # Changed JSON part.
+        copyfile(AEON2, TEST_AEON3)
+        os.remove(TEST_AEON2)
+        summary = extract_json.run_batch(sources, workers=1, cachePath=TEST_CACHE)
+        self.assertEqual((summary['hits'], summary['misses']), (0, 2))
+        self.assertEqual(summary['failed'], 2)
+        self.assertEqual(extract_json.load_cache(TEST_CACHE), {})
+
+        copyfile(AEON3, TEST_AEON3)
+        summary = extract_json.run_batch([TEST_AEON3], workers=1, cachePath=TEST_CACHE, force=True)
+        self.assertEqual((summary['hits'], summary['misses']), (0, 1))
+        self.assertEqual(read_file(TEST_JSON3), read_file(REF_JSON3))
+
+    def test_map_timeline(self):
+        message, jsonData = extract_json.map_timeline(AEON3)
+        self.assertEqual(message, 'Timeline data read in.')
+        self.assertEqual(jsonData, json.loads(extract_json.scan_file(AEON3)))
+        message, jsonData = extract_json.map_timeline(TEST_AEON3)
+        self.assertTrue(message.startswith(extract_json.ERROR))
+        self.assertIsNone(jsonData)
+
+
+class JsonRegion(unittest.TestCase):
+    """Locate the JSON part in binary data."""
+
+    def test_chunk_boundaries(self):
+        data = b'\x00\x01{"a": {"b": 1}, "c": {}}\x00{}'
+        for chunkSize in (1, 2, 3, 7, 1024):
+            self.assertEqual(extract_json.find_json_region(data, chunkSize), (2, 26))
+        self.assertEqual(bytes(extract_json.get_json_region(data)), data[2:26])
+
+    def test_no_json(self):
+        self.assertEqual(extract_json.find_json_region(b'\x00\x01}'), (0, 0))
+
+    def test_unbalanced(self):
+        self.assertIsNone(extract_json.find_json_region(b'\x00{{}\x00', 2))
+        self.assertIsNone(extract_json.get_json_region(b'\x00{{}\x00'))
+
 
 def main():
     unittest.main()
@@ -0,0 +1,134 @@
+"""Unit tests for zodiac and zodiac_eras
+Part of the paeon project (https://github.com/peter88213/paeon)
+Copyright (c) 2026 Peter Triesberger
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from contextlib import redirect_stderr
+import io
+import json
+import os
+from shutil import copyfile
+from shutil import rmtree
+import unittest
+
+import zodiac
+import zodiac3
+import zodiac_calendar
+import zodiac_eras
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/zodiac/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+TEMPLATE = TEST_DATA_PATH + 'fiction.xml'
+TEST_TEMPLATE = TEST_EXEC_PATH + 'fiction.xml'
+ZODIAC = TEST_DATA_PATH + 'zodiac.xml'
+TEST_ZODIAC = TEST_EXEC_PATH + 'zodiac.xml'
+ZODIAC_ERAS = TEST_DATA_PATH + 'zodiac-eras.xml'
+TEST_ZODIAC_ERAS = TEST_EXEC_PATH + 'zodiac-eras.xml'
+TEST_TEMPLATE3 = TEST_EXEC_PATH + 'fiction.aeonTpl'
+TEST_ZODIAC3 = TEST_EXEC_PATH + 'zodiac.aeonTpl'
+TEST_CACHE = TEST_EXEC_PATH + 'zodiac-cache'
+
+
+def read_file(inputFile):
+    with open(inputFile, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class NormalOperation(unittest.TestCase):
+    """Operation under normal condition, i.e.:
+    * Test data is present and readable 
+    * test data integrity is o.k.
+    """
+
+    def setUp(self):
+        copyfile(TEMPLATE, TEST_TEMPLATE)
+
+    def tearDown(self):
+
+        for filePath in (TEST_TEMPLATE, TEST_ZODIAC, TEST_ZODIAC_ERAS, TEST_TEMPLATE3, TEST_ZODIAC3):
+            try:
+                os.remove(filePath)
+            except:
+                pass
+        rmtree(TEST_CACHE, ignore_errors=True)
+
+    def test_zodiac(self):
+        zodiac.main(TEST_TEMPLATE)
+        self.assertEqual(read_file(TEST_ZODIAC), read_file(ZODIAC))
+
+    def test_zodiac_eras(self):
+        zodiac_eras.main(TEST_TEMPLATE)
+        self.assertEqual(read_file(TEST_ZODIAC_ERAS), read_file(ZODIAC_ERAS))
+
+    def test_zodiac_cached(self):
+        zodiac.main(TEST_TEMPLATE, cacheDir=TEST_CACHE)
+        self.assertEqual(len(os.listdir(TEST_CACHE)), 1)
+        zodiac.main(TEST_TEMPLATE, cacheDir=TEST_CACHE)
+        self.assertEqual(read_file(TEST_ZODIAC), read_file(ZODIAC))
+
+    def test_zodiac3(self):
+        with open(TEST_TEMPLATE3, 'w', encoding='utf-8') as f:
+            json.dump({'definitions': {'calendar': {'eras': []}}}, f)
+        zodiac3.main(TEST_TEMPLATE3, span=24)
+        with open(TEST_ZODIAC3, 'r', encoding='utf-8') as f:
+            eras = json.load(f)['definitions']['calendar']['eras']
+        self.assertEqual(len(eras), 26)
+        self.assertEqual(eras[0]['name'], zodiac_calendar.FIRST_ERA_NAME)
+        self.assertEqual(eras[13]['shortName'], '♈, Era 2 "Fire"')
+        self.assertEqual(eras[-1]['name'], zodiac_calendar.LAST_ERA_NAME)
+
+    def test_zodiac3_compact(self):
+        with open(TEST_TEMPLATE3, 'w', encoding='utf-8') as f:
+            json.dump({'definitions': {'calendar': {'eras': []}, 'name': 'ä'}}, f)
+        zodiac3.main(TEST_TEMPLATE3, span=24)
+        with open(TEST_ZODIAC3, 'r', encoding='utf-8') as f:
+            text = f.read()
+        self.assertEqual(json.dumps(json.loads(text)), text)
+        size = len(text.encode('utf-8'))
+        zodiac3.main(TEST_TEMPLATE3, span=24, compact=True)
+        with open(TEST_ZODIAC3, 'r', encoding='utf-8') as f:
+            compactText = f.read()
+        self.assertEqual(json.dumps(json.loads(compactText), separators=(',', ':'), ensure_ascii=False), compactText)
+        self.assertLess(len(compactText.encode('utf-8')), size)
+
+
+class Calendar(unittest.TestCase):
+    """Calendar parameters and cache."""
+
+    def tearDown(self):
+        rmtree(TEST_CACHE, ignore_errors=True)
+
+    def test_parameters(self):
+        eras = zodiac_calendar.build_calendar(zodiac_calendar.MODE_ERAS, 3, 60, ['Wood', 'Fire'])
+        self.assertEqual(eras[:3], [
+            ('Era 1 "Era of Wood"', 'Era 1 "Wood"', 60),
+            ('Era 2 "Era of Fire"', 'Era 2 "Fire"', 60),
+            ('Era 3 "Era of Wood"', 'Era 3 "Wood"', 60),
+        ])
+        self.assertEqual(eras[3][0], zodiac_calendar.LAST_ERA_NAME)
+
+    def test_arguments(self):
+        parser = zodiac_calendar.get_argument_parser('Test', 10, 'Number of years.')
+        args = zodiac_calendar.parse_arguments(parser, ['template.xml', '--span', '1', '--cycle', '1'])
+        self.assertEqual((args.span, args.cycle), (1, 1))
+        for arguments in (['--cycle', '0'], ['--span', '0'], ['--span', '-5']):
+            with redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    zodiac_calendar.parse_arguments(parser, ['template.xml'] + arguments)
+
+    def test_cache(self):
+        eras = zodiac_calendar.get_calendar(zodiac_calendar.MODE_YEARS, 100, cacheDir=TEST_CACHE)
+        self.assertEqual(zodiac_calendar.get_calendar(zodiac_calendar.MODE_YEARS, 100, cacheDir=TEST_CACHE), eras)
+        self.assertEqual(zodiac_calendar.build_calendar(zodiac_calendar.MODE_YEARS, 100), eras)
+        zodiac_calendar.get_calendar(zodiac_calendar.MODE_YEARS, 101, cacheDir=TEST_CACHE)
+        self.assertEqual(len(os.listdir(TEST_CACHE)), 2)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Unit tests for zodiac_stamp
+Part of the paeon project (https://github.com/peter88213/paeon)
+Copyright (c) 2026 Peter Triesberger
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+from shutil import copyfile
+import unittest
+
+import aeon2moon
+from aeon_timeline import Timeline
+import zodiac_stamp
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+ZODIAC = TEST_DATA_PATH + 'zodiac/zodiac.aeonzip'
+ZODIAC_ERAS = TEST_DATA_PATH + 'zodiac/zodiac-eras.aeonzip'
+AEON3 = TEST_DATA_PATH + 'Murder on the Orient Express.aeon'
+TEST_AEON2 = TEST_EXEC_PATH + 'stamp.aeonzip'
+TEST_AEON3 = TEST_EXEC_PATH + 'stamp.aeon'
+
+DAY = 86400
+YEAR = 365 * DAY
+
+
+def get_era(name, duration, isBackwards=False, hasLeapYears=False):
+    return {'name': name, 'duration': duration, 'isBackwards': isBackwards, 'hasLeapYears': hasLeapYears}
+
+
+def get_calendar(eras):
+    return {
+        'hoursInDay': 24,
+        'months': [{'normalDuration': 31, 'leapDuration': 31}, {'normalDuration': 334, 'leapDuration': 335}],
+        'eras': eras,
+    }
+
+
+def get_values(filePath):
+    __, jsonData = aeon2moon.open_timeline(filePath)
+    timeline = Timeline(jsonData)
+    propertyGuid = timeline.get_property_guid(zodiac_stamp.PROPERTY_ZODIAC_ERA)
+    return {evt['title']: timeline.get_value(evt, propertyGuid) for evt in timeline.events}
+
+
+class EraLookup(unittest.TestCase):
+    """Era boundaries and binary search."""
+
+    def test_boundaries(self):
+        eraTable = zodiac_stamp.EraTable(get_calendar([
+            get_era('Past', 100, isBackwards=True),
+            get_era('A', 1),
+            get_era('B', 12),
+            get_era('C', 2),
+            get_era('Future', 9007199254740992),
+        ]))
+        self.assertEqual(eraTable.yearSeconds, YEAR)
+        self.assertEqual(eraTable.boundaries, [-15 * YEAR, -14 * YEAR, -2 * YEAR, 0])
+        self.assertEqual(
+            zodiac_stamp.ZodiacEraCalculator(eraTable).calculate(
+                [-15 * YEAR - 1, -15 * YEAR, -14 * YEAR - 1, -14 * YEAR, -3 * YEAR, -2 * YEAR, 10 * YEAR, None]),
+            ['Past', 'A', 'A', '♈ Aries, B', '♓ Pisces, B', '♈ Aries, C', 'Future', '']
+        )
+
+    def test_leap_years(self):
+        eraTable = zodiac_stamp.EraTable(get_calendar([
+            get_era('Old', 400, hasLeapYears=True),
+            get_era('New', 2147483647, hasLeapYears=True),
+        ]))
+        self.assertEqual(eraTable.boundaries, [-146097 * DAY, 0])
+        self.assertEqual(eraTable.get_era_index(-146097 * DAY - 1), -1)
+        self.assertEqual(eraTable.get_era_index(-1), 0)
+        self.assertEqual(eraTable.get_era_index(0), 1)
+
+
+class NormalOperation(unittest.TestCase):
+    """Operation under normal condition, i.e.:
+    * Test data is present and readable
+    * test data integrity is o.k.
+    """
+
+    def tearDown(self):
+
+        for filePath in (TEST_AEON2, TEST_AEON3):
+            try:
+                os.remove(filePath)
+            except:
+                pass
+
+    def test_zodiac_years(self):
+        copyfile(ZODIAC, TEST_AEON2)
+        self.assertEqual(zodiac_stamp.run(TEST_AEON2, backup=False),
+                         f'"{os.path.normpath(TEST_AEON2)}" written. Zodiac era changed in 2 events.')
+        self.assertEqual(get_values(TEST_AEON2), {
+            'Begin of History': 'Aries Era 1 "Era of Water"',
+            'End of History': 'Capricorn Era 83 "Era of Wood"',
+        })
+        self.assertEqual(zodiac_stamp.run(TEST_AEON2, backup=False),
+                         f'"{os.path.normpath(TEST_AEON2)}" is up to date. Zodiac era changed in 0 events.')
+
+    def test_ad_required(self):
+        copyfile(ZODIAC, TEST_AEON2)
+        calculator = zodiac_stamp.ZodiacEraCalculator()
+        self.assertEqual(aeon2moon.enrich(TEST_AEON2, [calculator], backup=False),
+                         f'{aeon2moon.ERROR}"AD" era is missing in the calendar.')
+
+    def test_zodiac_eras(self):
+        copyfile(ZODIAC_ERAS, TEST_AEON2)
+        zodiac_stamp.run(TEST_AEON2, backup=False)
+        self.assertEqual(get_values(TEST_AEON2), {
+            'Begin of History': '♈ Aries, Era 1 "Era of Water"',
+            'End of History': '♓ Pisces, Era 98 "Era of Fire"',
+        })
+
+    def test_aeon3(self):
+        copyfile(AEON3, TEST_AEON3)
+        self.assertEqual(zodiac_stamp.run(TEST_AEON3, backup=False),
+                         f'"{os.path.normpath(TEST_AEON3)}" written. Zodiac era changed in 137 events.')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()